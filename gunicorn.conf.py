@@ -0,0 +1,43 @@
+"""
+Профілі запуску gunicorn (читається автоматично з кореня проєкту: `gunicorn`).
+
+SERVER_PROFILE=wsgi (типово) — reklamnyresurs.wsgi, потокові sync-воркери;
+SERVER_PROFILE=asgi          — reklamnyresurs.asgi під uvicorn-воркерами: async view
+                               (головна, каталог, новини, пошук, лічильник непрочитаних)
+                               і WebSocket чату підтримки працюють без потоку на запит.
+
+Лічильник непрочитаних, кеш сторінок, обмеження спроб входу й брокер WebSocket-подій
+типово живуть у пам'яті процесу, тож без спільного кешу (CACHE_URL) і, для asgi,
+міжпроцесного брокера (SUPPORT_CHAT_BROKER) запускається один воркер.
+
+Порівняння профілів: `manage.py run_load_test --label wsgi`, потім
+`manage.py run_load_test --label asgi --compare load_wsgi.json`.
+"""
+import multiprocessing
+import os
+
+SERVER_PROFILE = os.environ.setdefault('SERVER_PROFILE', 'wsgi')
+IN_PROCESS_BROKER = 'main.realtime.InProcessBroker'
+
+SHARED_STATE = bool(os.environ.get('CACHE_URL')) and (
+    SERVER_PROFILE != 'asgi' or os.environ.get('SUPPORT_CHAT_BROKER', IN_PROCESS_BROKER) != IN_PROCESS_BROKER
+)
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1 if SHARED_STATE else 1))
+if workers > 1 and not SHARED_STATE:
+    raise RuntimeError(
+        f"GUNICORN_WORKERS={workers} потребує спільного стану між процесами: задайте CACHE_URL"
+        + (" і SUPPORT_CHAT_BROKER" if SERVER_PROFILE == 'asgi' else "")
+    )
+keepalive = 5
+timeout = 30
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+
+if SERVER_PROFILE == 'asgi':
+    wsgi_app = 'reklamnyresurs.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'reklamnyresurs.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
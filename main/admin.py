@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Service, News, Contact, Order, SupportChat, ServiceOrder, UserProfile
+from .models import Service, News, Contact, Order, ServiceOrder, UserProfile, SupportConversation, ImageJob, MediaBlob, ServiceOrderHistory
 
 admin.site.register(UserProfile)
 
@@ -25,8 +25,50 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ('title', 'user__username')
 
 
+class ServiceOrderHistoryInline(admin.TabularInline):
+    model = ServiceOrderHistory
+    extra = 0
+    can_delete = False
+    readonly_fields = ('from_status', 'to_status', 'changed_by', 'changed_at')
+
+
+def _status_action(status, label):
+    # 🔹 Масова зміна статусу: один UPDATE і запис історії, без save() для кожного рядка
+    def action(modeladmin, request, queryset):
+        changed = ServiceOrder.bulk_transition(queryset, status, changed_by=request.user)
+        modeladmin.message_user(request, f"Статус «{label}» встановлено для замовлень: {changed}")
+    action.__name__ = f'mark_{status}'
+    action.short_description = f"Перевести у «{label}»"
+    return action
+
+
 @admin.register(ServiceOrder)
 class ServiceOrderAdmin(admin.ModelAdmin):
     list_display = ('service', 'user', 'status', 'created_at')
     list_filter = ('status', 'created_at')
+    list_select_related = ('service', 'user')
     search_fields = ('user__username', 'service__title', 'description')
+    readonly_fields = ('status',)
+    inlines = [ServiceOrderHistoryInline]
+    actions = [_status_action(status, label) for status, label in ServiceOrder.STATUS_CHOICES]
+
+
+@admin.register(SupportConversation)
+class SupportConversationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'last_message', 'last_time', 'unread_count')
+    search_fields = ('user__username',)
+    list_select_related = ('user',)
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('model_label', 'object_id', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'model_label')
+    readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'refcount', 'created_at')
+    search_fields = ('name',)
+    readonly_fields = ('name', 'size', 'refcount', 'created_at')
@@ -0,0 +1,134 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+CONTENT_VERSION_KEY = 'public:content_version'
+
+
+def _timeout():
+    return getattr(settings, 'PUBLIC_PAGE_CACHE_TIMEOUT', 300)
+
+
+def get_content_version():
+    """
+    Версія публічного контенту (час останньої зміни послуг, новин або контактів).
+    Вона входить у ключі кешу, тож інвалідація — це просто нова версія.
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time()
+        if not cache.add(CONTENT_VERSION_KEY, version, _timeout()):
+            version = cache.get(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def bump_content_version():
+    cache.set(CONTENT_VERSION_KEY, time.time(), _timeout())
+
+
+async def aget_content_version():
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time()
+        if not await cache.aadd(CONTENT_VERSION_KEY, version, _timeout()):
+            version = await cache.aget(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def _is_cacheable_request(request, user):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Flash-повідомлення показуються один раз — таку сторінку не кешуємо
+    if CookieStorage.cookie_name in request.COOKIES:
+        return False
+    return not user.is_authenticated
+
+
+def _page_keys(request, view_func, version):
+    """ETag, Last-Modified і ключ кешу сторінки для поточної версії контенту."""
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    etag = quote_etag(hashlib.md5(f'{path_hash}:{version}'.encode()).hexdigest())
+    key = f'public:page:{view_func.__name__}:{path_hash}:{version}'
+    return etag, int(version), key
+
+
+def _is_storable(response):
+    return response.status_code == 200 and not response.cookies and not getattr(response, 'streaming', False)
+
+
+def _add_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'max-age=0, must-revalidate'
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def cache_public_page(view_func):
+    """
+    Кешує відповідь для анонімних відвідувачів і відповідає 304 на умовні
+    GET-запити (ETag / Last-Modified). Персонал і залогінені користувачі
+    завжди отримують свіжу сторінку. Підтримує і звичайні, і async view.
+    """
+    if iscoroutinefunction(view_func):
+        return _cache_public_page_async(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request, request.user):
+            return view_func(request, *args, **kwargs)
+
+        etag, last_modified, key = _page_keys(request, view_func, get_content_version())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view_func(request, *args, **kwargs)
+                if not _is_storable(response):
+                    return response
+                cache.set(key, (response.content, response['Content-Type']), _timeout())
+        return _add_validators(response, etag, last_modified)
+
+    return wrapper
+
+
+async def _arequest_user(request):
+    user = await request.auser()
+    # request.user (view, контекст-процесори) кешує користувача окремо від auser() —
+    # підставляємо вже завантаженого, щоб auth_user не читався за запит двічі
+    request._cached_user = user
+    return user
+
+
+def _cache_public_page_async(view_func):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request, await _arequest_user(request)):
+            return await view_func(request, *args, **kwargs)
+
+        etag, last_modified, key = _page_keys(request, view_func, await aget_content_version())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = await view_func(request, *args, **kwargs)
+                if not _is_storable(response):
+                    return response
+                await cache.aset(key, (response.content, response['Content-Type']), _timeout())
+        return _add_validators(response, etag, last_modified)
+
+    return wrapper
@@ -0,0 +1,17 @@
+from django.contrib.staticfiles import finders
+from django.core.checks import Tags, Warning, register
+
+from .staticfiles import VENDOR_ASSETS
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_vendor_assets(app_configs, **kwargs):
+    """Без локальних копій static/vendor/ сторінки залежать від CDN (`manage.py check --deploy`)."""
+    missing = [path for path, _, _ in VENDOR_ASSETS.values() if finders.find(path) is None]
+    if not missing:
+        return []
+    return [Warning(
+        "Сторонні файли не збережені локально, сторінки підключають їх із CDN: " + ', '.join(missing),
+        hint="Виконайте `manage.py vendor_static_assets` і закомітьте static/vendor/.",
+        id='main.W001',
+    )]
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import re
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser, User
+
+from .counters import unread_count
+from .realtime import UNREAD_TOPIC, conversation_topic, get_broker
+
+CONVERSATION_PATH = re.compile(r'^/ws/support/(?P<user_id>\d+)/$')
+UNREAD_PATH = re.compile(r'^/ws/support/unread/$')
+
+
+class _ScopeRequest:
+    """Мінімальний об’єкт запиту, якого достатньо для django.contrib.auth.get_user."""
+
+    def __init__(self, session):
+        self.session = session
+
+
+def _headers(scope):
+    return {name.decode('latin1').lower(): value.decode('latin1') for name, value in scope.get('headers', [])}
+
+
+def _load_user(session_key):
+    if not session_key:
+        return AnonymousUser()
+    engine = import_module(settings.SESSION_ENGINE)
+    return get_user(_ScopeRequest(engine.SessionStore(session_key)))
+
+
+async def get_scope_user(scope):
+    cookie = SimpleCookie()
+    cookie.load(_headers(scope).get('cookie', ''))
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    return await sync_to_async(_load_user)(morsel.value if morsel else None)
+
+
+def _same_origin(scope):
+    # 🔒 Захист від cross-site WebSocket hijacking: Origin має збігатися з Host
+    headers = _headers(scope)
+    origin = headers.get('origin')
+    if not origin:
+        return True
+    return urlsplit(origin).netloc == headers.get('host')
+
+
+def _create_message(owner_id, sender, text):
+    from .models import SupportChat
+    SupportChat.post(owner_id, sender, text, is_admin=sender.is_staff)
+
+
+async def _send_json(send, payload):
+    await send({'type': 'websocket.send', 'text': json.dumps(payload, ensure_ascii=False)})
+
+
+async def _serve(scope, receive, send, topic, on_text=None, initial=None):
+    """Спільний цикл з’єднання: приймає кадри клієнта і пересилає події брокера."""
+    broker = get_broker()
+    subscription = broker.subscribe(topic)
+    receiver = publisher = None
+    await send({'type': 'websocket.accept'})
+    try:
+        if initial is not None:
+            await _send_json(send, initial)
+        receiver = asyncio.ensure_future(receive())
+        publisher = asyncio.ensure_future(subscription.queue.get())
+        while True:
+            done, _ = await asyncio.wait({receiver, publisher}, return_when=asyncio.FIRST_COMPLETED)
+            if publisher in done:
+                await _send_json(send, publisher.result())
+                publisher = asyncio.ensure_future(subscription.queue.get())
+            if receiver in done:
+                event = receiver.result()
+                if event['type'] == 'websocket.disconnect':
+                    break
+                if event['type'] == 'websocket.receive' and on_text and event.get('text'):
+                    await on_text(event['text'])
+                receiver = asyncio.ensure_future(receive())
+    finally:
+        broker.unsubscribe(subscription)
+        for task in (receiver, publisher):
+            if task is not None:
+                task.cancel()
+
+
+async def conversation_consumer(scope, receive, send, user_id):
+    user = await get_scope_user(scope)
+    if not user.is_authenticated or not (user.is_staff or user.id == user_id):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    if user.id != user_id and not await User.objects.filter(pk=user_id).aexists():
+        # Як і HTTP API чату: розмови неіснуючого користувача немає (інакше перше повідомлення впаде на FK)
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+
+    async def on_text(text):
+        try:
+            message = str(json.loads(text).get('message', '')).strip()
+        except (ValueError, AttributeError):
+            return
+        if message:
+            # Відповідь клієнт отримає через брокер разом з іншими учасниками
+            await sync_to_async(_create_message)(user_id, user, message)
+
+    await _serve(scope, receive, send, conversation_topic(user_id), on_text=on_text)
+
+
+async def unread_consumer(scope, receive, send):
+    user = await get_scope_user(scope)
+    if not user.is_authenticated or not user.is_staff:
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    count = await sync_to_async(unread_count)()
+    await _serve(scope, receive, send, UNREAD_TOPIC, initial={'type': 'unread', 'count': count})
+
+
+async def websocket_application(scope, receive, send):
+    """ASGI-застосунок для scope['type'] == 'websocket'."""
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+    if not _same_origin(scope):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+
+    path = scope['path']
+    match = CONVERSATION_PATH.match(path)
+    if match:
+        await conversation_consumer(scope, receive, send, int(match['user_id']))
+    elif UNREAD_PATH.match(path):
+        await unread_consumer(scope, receive, send)
+    else:
+        await send({'type': 'websocket.close', 'code': 4404})
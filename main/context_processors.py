@@ -1,7 +1,6 @@
-from .models import SupportChat
+from .counters import unread_count
 
 def unread_messages(request):
     if request.user.is_authenticated and request.user.is_staff:
-        count = SupportChat.objects.filter(is_read=False).count()
-        return {'unread_messages_count': count}
+        return {'unread_messages_count': unread_count()}
     return {}
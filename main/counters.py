@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+UNREAD_CACHE_KEY = 'support:unread_count'
+
+
+def _timeout():
+    return getattr(settings, 'SUPPORT_UNREAD_CACHE_TIMEOUT', None)
+
+
+def count_unread_in_db():
+    # Використовує частковий індекс supportchat_unread_idx (лише непрочитані рядки)
+    from .models import SupportChat
+    return SupportChat.objects.filter(is_read=False).count()
+
+
+async def acount_unread_in_db():
+    from .models import SupportChat
+    return await SupportChat.objects.filter(is_read=False).acount()
+
+
+def unread_count():
+    """
+    Кількість непрочитаних повідомлень для персоналу з кешу. До таблиці
+    звертаємось лише тоді, коли значення в кеші ще немає або воно застаріло.
+    """
+    count = cache.get(UNREAD_CACHE_KEY)
+    if count is None:
+        count = count_unread_in_db()
+        cache.add(UNREAD_CACHE_KEY, count, _timeout())
+    return max(count, 0)
+
+
+async def aunread_count():
+    """Асинхронний варіант unread_count для async view."""
+    count = await cache.aget(UNREAD_CACHE_KEY)
+    if count is None:
+        count = await acount_unread_in_db()
+        await cache.aadd(UNREAD_CACHE_KEY, count, _timeout())
+    return max(count, 0)
+
+
+def _apply_unread_delta(delta):
+    try:
+        if delta > 0:
+            cache.incr(UNREAD_CACHE_KEY, delta)
+        else:
+            cache.decr(UNREAD_CACHE_KEY, -delta)
+    except ValueError:
+        pass
+
+
+def adjust_unread_count(delta):
+    """
+    Інкрементально змінює лічильник після коміту транзакції, тож відкочені
+    повідомлення його не зачіпають. Якщо ключа немає — його порахує наступне читання.
+    """
+    if delta:
+        transaction.on_commit(lambda: _apply_unread_delta(delta))
+
+
+def reconcile_unread_count():
+    """Звіряє кешований лічильник із базою та повертає пару (було, стало)."""
+    cached = cache.get(UNREAD_CACHE_KEY)
+    actual = count_unread_in_db()
+    cache.set(UNREAD_CACHE_KEY, actual, _timeout())
+    return cached, actual
@@ -0,0 +1,24 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import connections, transaction
+
+# Один записувач на процес: потоки одного воркера не змагаються за блокування SQLite
+_write_lock = threading.RLock()
+
+
+@contextmanager
+def serialized_write(using='default'):
+    """
+    Транзакція для «гарячих» записів (повідомлення чату, позначки прочитання).
+    На SQLite записи в межах процесу серіалізуються локом, а між процесами —
+    BEGIN IMMEDIATE (transaction_mode) з busy_timeout, тому замість миттєвого
+    "database is locked" запит коротко чекає своєї черги.
+    """
+    if connections[using].vendor != 'sqlite':
+        with transaction.atomic(using=using):
+            yield
+        return
+    with _write_lock:
+        with transaction.atomic(using=using):
+            yield
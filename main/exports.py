@@ -0,0 +1,128 @@
+import csv
+import json
+import zlib
+from datetime import datetime, time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import ServiceOrder, SupportChat
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+# Скільки байтів накопичувати перед відправкою клієнту
+FLUSH_BYTES = 64 * 1024
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class ExportSpec:
+    """Опис вивантаження: колонки (values_list), поле дати для фільтра, базовий queryset."""
+
+    def __init__(self, model, date_field, columns):
+        self.model = model
+        self.date_field = date_field
+        self.columns = columns
+
+    def queryset(self, date_from=None, date_to=None):
+        queryset = self.model._default_manager.all()
+        if date_from:
+            queryset = queryset.filter(**{f'{self.date_field}__gte': _day_start(date_from)})
+        if date_to:
+            queryset = queryset.filter(**{f'{self.date_field}__lt': _day_start(date_to, next_day=True)})
+        # values_list: без створення об'єктів моделей; pk — стабільний порядок для потоку
+        return queryset.order_by('pk').values_list(*self.columns)
+
+
+EXPORTS = {
+    'orders': ExportSpec(ServiceOrder, 'created_at', (
+        'id', 'created_at', 'status', 'user_id', 'user__username', 'user__email',
+        'service_id', 'service__title', 'description',
+    )),
+    'users': ExportSpec(User, 'date_joined', (
+        'id', 'username', 'email', 'first_name', 'last_name', 'is_staff',
+        'date_joined', 'last_login', 'profile__phone',
+    )),
+    'chat': ExportSpec(SupportChat, 'created_at', (
+        'id', 'user_id', 'user__username', 'sender_id', 'is_admin', 'is_read', 'created_at', 'message',
+    )),
+}
+
+
+def _day_start(day, next_day=False):
+    value = datetime.combine(day, time.min)
+    if next_day:
+        value += timezone.timedelta(days=1)
+    return timezone.make_aware(value) if settings.USE_TZ else value
+
+
+class _Buffer:
+    """Приймач для csv.writer: повертає рядок замість запису у файл."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Buffer())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _jsonl_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _chunked(lines):
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 — формат gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(name, fmt='csv', date_from=None, date_to=None, compress=False, chunk_size=None):
+    """
+    🔹 Потік байтів вивантаження ``name`` у форматі csv або jsonl. Рядки читаються
+    з бази пакетами по EXPORT_CHUNK_SIZE (QuerySet.iterator), тож пам'ять не росте
+    з розміром таблиці, а перші байти йдуть клієнту одразу.
+    """
+    spec = EXPORTS[name]
+    rows = spec.queryset(date_from, date_to).iterator(chunk_size=chunk_size or EXPORT_CHUNK_SIZE)
+    lines = _csv_lines(spec.columns, rows) if fmt == 'csv' else _jsonl_lines(spec.columns, rows)
+    chunks = _chunked(lines)
+    return _gzipped(chunks) if compress else chunks
+
+
+async def aiterate(iterable):
+    """
+    Асинхронна обгортка потоку для ASGI: без неї Django зібрав би весь
+    синхронний StreamingHttpResponse у пам'ять. Курсор живе в одному потоці.
+    """
+    iterator = iter(iterable)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await next_chunk(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+# Вартість хешування з PASSWORD_HASH_COST (settings.py). Якщо параметри
+# збереженого хешу відрізняються, Django перехешовує пароль при наступному вході.
+_COST = getattr(settings, 'PASSWORD_HASH_COST', {})
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt (є в стандартній бібліотеці) з вартістю з налаштувань."""
+
+    work_factor = _COST.get('scrypt', {}).get('work_factor', ScryptPasswordHasher.work_factor)
+    block_size = _COST.get('scrypt', {}).get('block_size', ScryptPasswordHasher.block_size)
+    parallelism = _COST.get('scrypt', {}).get('parallelism', ScryptPasswordHasher.parallelism)
+    # Типовий ліміт hashlib (32 МБ) замалий для work_factor 2**15 і більше; запас — для старих хешів
+    maxmem = 4 * 128 * block_size * work_factor
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id (пакет argon2-cffi) з вартістю з налаштувань."""
+
+    time_cost = _COST.get('argon2', {}).get('time_cost', Argon2PasswordHasher.time_cost)
+    memory_cost = _COST.get('argon2', {}).get('memory_cost', Argon2PasswordHasher.memory_cost)
+    parallelism = _COST.get('argon2', {}).get('parallelism', Argon2PasswordHasher.parallelism)
@@ -0,0 +1,123 @@
+import json
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from main.perf import percentile
+
+from .seed_benchmark_data import USER_PREFIX
+
+LEGIT_IP = '192.0.2.1'
+
+
+class Command(BaseCommand):
+    help = (
+        "Імітує підбір паролів (credential stuffing) на login_view: кілька потоків шлють "
+        "невірні паролі з кількох IP, а справжній користувач тим часом входить з іншої адреси. "
+        "Порівнює пропускну здатність і кількість обчислених хешів без обмежень і з THROTTLE_RATES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=300, help="Спроб атакувальника на прогін")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--ips', type=int, default=4, help="Скільки IP-адрес в атакувальника")
+        parser.add_argument('--emails', type=int, default=50, help="Скільки email перебирати")
+        parser.add_argument('--legit', type=int, default=10, help="Входів справжнього користувача під час атаки")
+        parser.add_argument('--output', default='bench_login.json')
+
+    def handle(self, *args, **options):
+        emails = list(
+            User.objects.filter(username__startswith=USER_PREFIX).order_by('pk')
+            .values_list('email', flat=True)[:options['emails'] + 1]
+        )
+        if len(emails) < 2:
+            raise CommandError("Немає бенчмарк-даних: спершу виконайте `manage.py seed_benchmark_data`.")
+        legit_email, emails = emails[0], emails[1:]
+
+        hasher = get_hasher()
+        t0 = time.perf_counter()
+        make_password('bench-password')
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'hasher': hasher.algorithm,
+            'hash_ms': round((time.perf_counter() - t0) * 1000, 2),
+            'runs': {},
+        }
+        self.stdout.write(f"Алгоритм: {results['hasher']}, один хеш: {results['hash_ms']} мс")
+
+        # Кожна відповідь 429 інакше пише попередження в лог django.request
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        with override_settings(ALLOWED_HOSTS=['*']):
+            with override_settings(THROTTLE_RATES={}):
+                results['runs']['unthrottled'] = self.run(emails, legit_email, options)
+            results['runs']['throttled'] = self.run(emails, legit_email, options)
+
+        for name, run in results['runs'].items():
+            self.stdout.write(
+                f"{name:<12} {run['throughput_rps']:>8} спроб/с  відхилено 429: {run['rejected']:>5}  "
+                f"хешів: {run['hashed']:>5}  вхід користувача p50 {run['legit_ms']['p50']} мс "
+                f"(успішних {run['legit_ok']}/{options['legit']})"
+            )
+        Path(options['output']).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Результати збережено у {options['output']}"))
+
+    def run(self, emails, legit_email, options):
+        cache.clear()
+        login_url = reverse('login')
+        counter = iter(range(options['attempts']))
+        lock = threading.Lock()
+        statuses = []
+        local = threading.local()
+
+        def attacker():
+            while True:
+                with lock:
+                    n = next(counter, None)
+                if n is None:
+                    return
+                if getattr(local, 'client', None) is None:
+                    local.client = Client(REMOTE_ADDR=f'198.51.100.{n % options["ips"] + 1}')
+                response = local.client.post(login_url, {'email': emails[n % len(emails)], 'password': f'wrong-{n}'})
+                with lock:
+                    statuses.append(response.status_code)
+
+        legit = Client(REMOTE_ADDR=LEGIT_IP)
+        legit_latencies, legit_ok = [], 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for _ in range(options['concurrency']):
+                pool.submit(attacker)
+            # Справжній користувач входить, поки атака триває
+            for _ in range(options['legit']):
+                t0 = time.perf_counter()
+                response = legit.post(login_url, {'email': legit_email, 'password': 'bench-password'})
+                legit_latencies.append((time.perf_counter() - t0) * 1000)
+                legit_ok += response.status_code == 302 and response.url == reverse('profile')
+                legit.logout()
+        elapsed = time.perf_counter() - started
+
+        legit_latencies.sort()
+        rejected = statuses.count(429)
+        return {
+            'attempts': len(statuses),
+            'throughput_rps': round(len(statuses) / elapsed, 2),
+            'rejected': rejected,
+            'hashed': len(statuses) - rejected,
+            'legit_ok': legit_ok,
+            'legit_ms': {
+                'mean': round(statistics.fmean(legit_latencies), 2),
+                'p50': round(percentile(legit_latencies, 50), 2),
+                'p95': round(percentile(legit_latencies, 95), 2),
+            },
+        }
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє прострочені сесії пакетами: короткі транзакції замість одного великого "
+        "DELETE, який на SQLite надовго блокує запис для всіх запитів."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.05, help="Пауза між пакетами, секунд")
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE.endswith('signed_cookies'):
+            self.stdout.write("Сесії зберігаються в cookie — на сервері прибирати нічого.")
+            return
+
+        now = timezone.now()
+        deleted = 0
+        while True:
+            # Індекс на expire_date: кожен пакет — діапазонний пошук, а не сканування таблиці
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list('session_key', flat=True)[:options['batch_size']]
+            )
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"Видалено прострочених сесій: {deleted}"))
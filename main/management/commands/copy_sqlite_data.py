@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+from main.counters import reconcile_unread_count
+from main.search import get_search_backend
+
+SOURCE_ALIAS = 'sqlite_source'
+
+
+def sorted_by_dependencies(models):
+    """Впорядковує моделі так, щоб таблиці з FK йшли після таблиць, на які посилаються."""
+    pending = {model: {
+        field.related_model for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model is not model and field.related_model in models
+    } for model in models}
+    ordered = []
+    while pending:
+        ready = [model for model, deps in pending.items() if not deps - set(ordered)]
+        if not ready:
+            raise CommandError("Циклічні залежності між моделями: " + ', '.join(m._meta.label for m in pending))
+        for model in sorted(ready, key=lambda m: m._meta.label):
+            ordered.append(model)
+            del pending[model]
+    return ordered
+
+
+@contextmanager
+def preserved_timestamps(models):
+    """🔹 Вимикає auto_now/auto_now_add, щоб bulk_create не перезаписав дати з SQLite."""
+    touched = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                touched.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in touched:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Переносить усі дані з файлу SQLite у поточну базу (напр. PostgreSQL) пакетними "
+        "вставками зі збереженням первинних ключів. Цільова база має бути вже змігрована."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=str(settings.BASE_DIR / 'db.sqlite3'), help="Файл SQLite-джерела")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **options):
+        path = Path(options['path']).resolve()
+        batch = options['batch_size']
+        target = connections['default']
+        if not path.exists():
+            raise CommandError(f"Файл {path} не знайдено")
+        if target.vendor == 'sqlite' and Path(target.settings_dict['NAME']).resolve() == path:
+            raise CommandError("Джерело і цільова база — той самий файл")
+
+        if options['interactive']:
+            answer = input(f"Усі дані бази '{target.settings_dict['NAME']}' буде замінено. Продовжити? [yes/no]: ")
+            if answer != 'yes':
+                self.stdout.write("Скасовано.")
+                return
+
+        # Тимчасовий аліас із типовими ключами (configure_settings вимагає 'default')
+        connections.settings[SOURCE_ALIAS] = connections.configure_settings({
+            'default': dict(target.settings_dict),
+            SOURCE_ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)},
+        })[SOURCE_ALIAS]
+        try:
+            self.copy(connections[SOURCE_ALIAS], target, batch)
+        finally:
+            connections[SOURCE_ALIAS].close()
+            del connections[SOURCE_ALIAS]
+            del connections.settings[SOURCE_ALIAS]
+
+        total = get_search_backend().rebuild(batch_size=batch)
+        reconcile_unread_count()
+        self.stdout.write(self.style.SUCCESS(f"Готово, проіндексовано записів пошуку: {total}"))
+
+    def copy(self, source, target, batch):
+        executor = MigrationExecutor(source)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            raise CommandError("Схема SQLite-джерела застаріла: спершу виконайте для нього migrate")
+
+        source_tables = set(source.introspection.table_names())
+        models = [
+            model for model in apps.get_models(include_auto_created=True)
+            if model._meta.managed and not model._meta.proxy and model._meta.db_table in source_tables
+        ]
+        models = sorted_by_dependencies(set(models))
+
+        # Без post_migrate: contenttypes і permissions прийдуть із джерела з тими ж id
+        call_command('flush', interactive=False, inhibit_post_migrate=True, database=target.alias, verbosity=0)
+
+        with preserved_timestamps(models), transaction.atomic(using=target.alias):
+            for model in models:
+                copied = 0
+                rows = []
+                for obj in model._base_manager.using(source.alias).order_by('pk').iterator(chunk_size=batch):
+                    rows.append(obj)
+                    if len(rows) >= batch:
+                        model._base_manager.using(target.alias).bulk_create(rows)
+                        copied += len(rows)
+                        rows = []
+                if rows:
+                    model._base_manager.using(target.alias).bulk_create(rows)
+                    copied += len(rows)
+                self.stdout.write(f"{model._meta.label}: {copied}")
+
+            # Послідовності PostgreSQL мають продовжуватися після перенесених id
+            with target.cursor() as cursor:
+                for sql in target.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
@@ -0,0 +1,159 @@
+import hashlib
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.models import MediaBlob
+from main.storage import CAS_PREFIX, content_addressed_fields, count_references
+from main.tasks import enqueue_image_job
+from main.thumbnails import delete_variants
+
+DEFAULT_DIRS = ('media', 'photo', 'img', 'static')
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _size(bytes_count):
+    return f"{bytes_count / 1024 / 1024:.2f} МБ"
+
+
+class Command(BaseCommand):
+    help = (
+        "Шукає однакові файли в media/, photo/, img/ і static/ та звітує, скільки місця "
+        "займають дублікати. З --apply переносить фото моделей у контентно-адресоване "
+        "сховище, замінює дублікати жорсткими посиланнями на одну копію (шляхи не змінюються) "
+        "і перераховує лічильники посилань MediaBlob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dirs', nargs='*', default=DEFAULT_DIRS, help="Каталоги відносно BASE_DIR")
+        parser.add_argument('--apply', action='store_true', help="Внести зміни (без нього — лише звіт)")
+
+    def handle(self, *args, **options):
+        apply = options['apply']
+        if apply:
+            self.adopt_model_files()
+
+        groups = self.find_duplicates([Path(settings.BASE_DIR) / d for d in options['dirs']])
+        duplicates = sum(len(paths) - 1 for paths in groups)
+        reclaimable = sum(size * (len(paths) - 1) for size, paths in self.sized(groups))
+        self.stdout.write(f"Груп однакових файлів: {len(groups)}, зайвих копій: {duplicates}, "
+                          f"можна звільнити: {_size(reclaimable)}")
+        for paths in groups:
+            self.stdout.write("  " + " = ".join(str(p.relative_to(settings.BASE_DIR)) for p in paths), self.style.NOTICE)
+
+        if not apply:
+            self.stdout.write("Звіт без змін; для застосування додайте --apply.")
+            return
+
+        reclaimed = self.collapse(groups)
+        fixed = self.rebuild_refcounts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Звільнено: {_size(reclaimed)}; виправлено лічильників посилань: {fixed}"
+        ))
+
+    def sized(self, groups):
+        return [(paths[0].stat().st_size, paths) for paths in groups]
+
+    def find_duplicates(self, roots):
+        """Групи шляхів з однаковим вмістом; файли, вже пов'язані жорстким посиланням, — одна копія."""
+        by_size = defaultdict(dict)
+        for root in roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = Path(dirpath) / filename
+                    if path.is_symlink() or not path.is_file():
+                        continue
+                    stat = path.stat()
+                    # Хешуємо лише файли, розмір яких збігається з іншими
+                    by_size[stat.st_size].setdefault((stat.st_dev, stat.st_ino), path)
+
+        groups = []
+        for size, inodes in by_size.items():
+            if len(inodes) < 2 or size == 0:
+                continue
+            by_hash = defaultdict(list)
+            for path in inodes.values():
+                by_hash[_sha256(path)].append(path)
+            groups.extend(sorted(paths) for paths in by_hash.values() if len(paths) > 1)
+        return sorted(groups)
+
+    def collapse(self, groups):
+        """Замінює копії жорсткими посиланнями на першу; повертає кількість звільнених байтів."""
+        reclaimed = 0
+        for paths in groups:
+            original, copies = paths[0], paths[1:]
+            for copy in copies:
+                tmp = copy.with_name(f'.{copy.name}.dedupe')
+                try:
+                    os.link(original, tmp)
+                    os.replace(tmp, copy)
+                except OSError as exc:
+                    tmp.unlink(missing_ok=True)
+                    self.stderr.write(f"{copy}: {exc}")
+                    continue
+                reclaimed += original.stat().st_size
+        return reclaimed
+
+    def adopt_model_files(self):
+        """Переносить фото, збережені до появи сховища, у cas/ і оновлює рядки моделей."""
+        fields = content_addressed_fields()
+        legacy_names = set()
+        for model, field in fields:
+            storage = field.storage
+            rows = (
+                model._default_manager.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                .exclude(**{f'{field.name}__startswith': CAS_PREFIX + '/'})
+            )
+            # Список, а не iterator(): таблицю оновлюємо під час обходу
+            for obj in list(rows.only('pk', field.attname)):
+                old_name = getattr(obj, field.attname).name
+                if not storage.exists(old_name):
+                    self.stderr.write(f"{model.__name__} #{obj.pk}: файл {old_name} не знайдено")
+                    continue
+                with transaction.atomic(), storage.open(old_name) as content:
+                    new_name = storage.save(old_name, content)
+                    model._default_manager.filter(pk=obj.pk).update(**{field.attname: new_name})
+                    # Зменшені копії для нового імені
+                    enqueue_image_job(obj, field.name)
+                legacy_names.add((storage, old_name))
+
+        # Старі файли видаляємо, лише коли на них не посилається жодна модель
+        for storage, name in legacy_names:
+            if not any(model._default_manager.filter(**{field.attname: name}).exists() for model, field in fields):
+                storage.delete(name)
+        self.stdout.write(f"Перенесено у сховище файлів моделей: {len(legacy_names)}")
+
+    def rebuild_refcounts(self):
+        """Звіряє MediaBlob з фактичними посиланнями; файли без посилань видаляються."""
+        references = count_references()
+        fixed = 0
+        storage = next((field.storage for _, field in content_addressed_fields()), None)
+        for blob in MediaBlob.objects.iterator():
+            actual = references.pop(blob.name, 0)
+            if actual == 0:
+                blob.delete()
+                if storage is not None:
+                    # Оминаємо лічильник: рядка MediaBlob уже немає
+                    FileSystemStorage.delete(storage, blob.name)
+                    delete_variants(storage, blob.name)
+                fixed += 1
+            elif blob.refcount != actual:
+                MediaBlob.objects.filter(pk=blob.pk).update(refcount=actual)
+                fixed += 1
+        for name, actual in references.items():
+            if storage is not None and storage.exists(name):
+                MediaBlob.objects.create(name=name, size=storage.size(name), refcount=actual)
+                fixed += 1
+        return fixed
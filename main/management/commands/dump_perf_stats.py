@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from main.perf import collect_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Виводить зведену статистику продуктивності по view (кількість запитів, SQL, шаблони, p50/p95/p99)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help="Вивести сирий JSON")
+        parser.add_argument('--sort', default='p95', choices=('p50', 'p95', 'p99', 'avg'),
+                            help="За яким показником загального часу сортувати")
+        parser.add_argument('--reset', action='store_true',
+                            help="Видалити всі знімки в PERF_STATS_DIR (живі воркери запишуть нові при наступному скиданні)")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Статистику продуктивності скинуто."))
+            return
+        stats = collect_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats, ensure_ascii=False, indent=2))
+            return
+        if not stats:
+            self.stdout.write("Статистики ще немає.")
+            return
+
+        header = f"{'view':<24}{'req':>7}{'N+1':>6}{'SQL avg':>9}{'SQL ms':>9}{'tpl ms':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        rows = sorted(stats.items(), key=lambda item: item[1]['total_ms'][options['sort']], reverse=True)
+        for name, s in rows:
+            self.stdout.write(
+                f"{name:<24}{s['requests']:>7}{s['n_plus_one_requests']:>6}{s['queries']['avg']:>9}"
+                f"{s['sql_ms']['avg']:>9}{s['template_ms']['avg']:>9}"
+                f"{s['total_ms']['p50']:>9}{s['total_ms']['p95']:>9}{s['total_ms']['p99']:>9}"
+            )
@@ -0,0 +1,53 @@
+import argparse
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from main import exports
+
+
+def _day(value):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise argparse.ArgumentTypeError(f"некоректна дата: {value} (очікується YYYY-MM-DD)")
+    return day
+
+
+class Command(BaseCommand):
+    help = (
+        "Потокове вивантаження замовлень (orders), користувачів із профілями (users) або "
+        "переписки підтримки (chat) у CSV чи JSONL. Рядки читаються пакетами, тож пам'ять "
+        "не залежить від розміру таблиці."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(exports.EXPORTS))
+        parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true', help="Стискати gzip на льоту")
+        parser.add_argument('--from', dest='date_from', type=_day, help="Починаючи з дати YYYY-MM-DD")
+        parser.add_argument('--to', dest='date_to', type=_day, help="По дату YYYY-MM-DD включно")
+        parser.add_argument('--output', default='-', help="Файл; типово stdout")
+        parser.add_argument('--chunk-size', type=int, help="Рядків на один запит до бази")
+
+    def handle(self, *args, **options):
+        stream = exports.export_stream(options['dataset'], options['format'], options['date_from'],
+                                       options['date_to'], compress=options['gzip'], chunk_size=options['chunk_size'])
+        started = time.perf_counter()
+        written = 0
+        out = sys.stdout.buffer if options['output'] == '-' else open(options['output'], 'wb')
+        try:
+            for chunk in stream:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        if options['output'] != '-':
+            self.stdout.write(self.style.SUCCESS(
+                f"Записано {written / 1024:.1f} КБ у {options['output']} за {time.perf_counter() - started:.2f} с"
+            ))
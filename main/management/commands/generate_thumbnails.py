@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from easy_thumbnails.exceptions import EasyThumbnailsError
+
+from main.models import News, Order, Service
+from main.thumbnails import generate_variants
+
+
+class Command(BaseCommand):
+    help = "Створює зменшені копії та WebP-варіанти для вже завантажених фото послуг, новин і замовлень."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Перегенерувати навіть наявні варіанти")
+
+    def handle(self, *args, **options):
+        created = failed = 0
+        for model in (Service, News, Order):
+            rows = model.objects.exclude(image='').exclude(image__isnull=True).only('pk', 'image')
+            for obj in rows.iterator(chunk_size=200):
+                try:
+                    created += generate_variants(obj.image, force=options['force'])
+                except (OSError, ValueError, EasyThumbnailsError) as exc:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} #{obj.pk} ({obj.image.name}): {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Створено варіантів: {created}, помилок: {failed}"))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.counters import count_unread_in_db, reconcile_unread_count
+from main.realtime import publish_unread_count
+
+
+class Command(BaseCommand):
+    help = "Звіряє кешований лічильник непрочитаних повідомлень із базою (запускати періодично, напр. з cron)."
+
+    def handle(self, *args, **options):
+        if not settings.SHARED_CACHE:
+            # LocMemCache цього процесу — веб-воркери зміни не побачать
+            self.stdout.write(self.style.WARNING(
+                "Кеш локальний для процесу: звіряти нічого, воркери оновлюють лічильник самі "
+                "раз на SUPPORT_UNREAD_CACHE_TIMEOUT с. Для звірки командою задайте CACHE_URL."
+            ))
+            self.stdout.write(f"Непрочитаних повідомлень у базі: {count_unread_in_db()}")
+            return
+
+        cached, actual = reconcile_unread_count()
+        publish_unread_count()
+        if cached is not None and cached != actual:
+            self.stdout.write(self.style.WARNING(f"Лічильник розійшовся з базою: {cached} → {actual}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Непрочитаних повідомлень: {actual}"))
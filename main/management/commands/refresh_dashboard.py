@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.rollups import REFRESH_BATCH, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Оновлює зведені таблиці панелі персоналу (/admin-dashboard/) за рядками, що з'явилися "
+        "після попереднього запуску, короткими транзакціями по --batch-size id. З --loop працює як "
+        "планувальник; --full перебудовує все (варто раз на добу, щоб врахувати видалені замовлення "
+        "й користувачів; до кінця перебудови панель показує неповні дані)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Перебудувати зведення з нуля")
+        parser.add_argument('--loop', type=float, metavar='SECONDS',
+                            help="Повторювати кожні SECONDS секунд (інкрементно)")
+        parser.add_argument('--batch-size', type=int, default=REFRESH_BATCH,
+                            help="Скільки id кожного джерела обробляти в одній транзакції")
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            started = time.perf_counter()
+            processed = refresh_rollups(full=full, batch_size=options['batch_size'])
+            self.stdout.write(
+                ("Перебудовано" if full else "Оновлено") + f" за {time.perf_counter() - started:.2f} с; нових рядків: "
+                + ", ".join(f"{source} {n}" for source, n in processed.items())
+            )
+            if not options['loop']:
+                break
+            full = False
+            time.sleep(options['loop'])
@@ -0,0 +1,140 @@
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from main.perf import percentile
+from main.models import SupportChat
+
+from .seed_benchmark_data import STAFF_USERNAME, USER_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        "Проганяє основні view через тестовий клієнт на поточній (заповненій) базі та "
+        "записує пропускну здатність, затримки й кількість SQL-запитів у JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help="Запитів на сценарій")
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--output', default='bench_results.json')
+        parser.add_argument('--compare', help="JSON попереднього запуску для пошуку регресій")
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help="Регресія, якщо p95 або кількість запитів зросли більш ніж на N%%")
+        parser.add_argument('--cold-cache', action='store_true',
+                            help="Очищати кеш перед кожним запитом (без кешу публічних сторінок)")
+        parser.add_argument('--only', nargs='*', help="Запустити лише вказані сценарії")
+
+    def scenarios(self):
+        staff = User.objects.filter(username=STAFF_USERNAME).first()
+        busiest = (
+            SupportChat.objects.filter(user__username__startswith=USER_PREFIX)
+            .values('user_id').annotate(n=Count('id')).order_by('-n').first()
+        )
+        if staff is None or busiest is None:
+            raise CommandError("Немає бенчмарк-даних: спершу виконайте `manage.py seed_benchmark_data`.")
+        customer = User.objects.get(pk=busiest['user_id'])
+
+        return {
+            'home': (None, reverse('home')),
+            'catalog': (None, reverse('catalog')),
+            'search': (None, reverse('search') + '?q=банер'),
+            'profile_view': (customer, reverse('profile')),
+            'admin_support_list': (staff, reverse('admin_support_list')),
+            'admin_chat_view': (staff, reverse('admin_chat', args=[customer.id])),
+        }
+
+    def run_scenario(self, user, url, iterations, warmup, cold_cache):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        for _ in range(warmup):
+            client.get(url)
+
+        latencies, queries = [], []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if cold_cache:
+                cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                t0 = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{url}: HTTP {response.status_code}")
+            queries.append(len(ctx.captured_queries))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'url': url,
+            'requests': iterations,
+            'throughput_rps': round(iterations / elapsed, 2),
+            'latency_ms': {
+                'mean': round(statistics.fmean(latencies), 2),
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2),
+            },
+            'queries': {'mean': round(statistics.fmean(queries), 2), 'max': max(queries)},
+        }
+
+    def handle(self, *args, **options):
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'cold_cache': options['cold_cache'],
+            'scenarios': {},
+        }
+        # Тестовий клієнт ходить як 'testserver'
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for name, (user, url) in self.scenarios().items():
+                if options['only'] and name not in options['only']:
+                    continue
+                cache.clear()
+                result = self.run_scenario(user, url, options['iterations'], options['warmup'], options['cold_cache'])
+                results['scenarios'][name] = result
+                self.stdout.write(
+                    f"{name:<20} {result['throughput_rps']:>8} req/s  "
+                    f"p50 {result['latency_ms']['p50']:>8} ms  p95 {result['latency_ms']['p95']:>8} ms  "
+                    f"SQL {result['queries']['mean']:>6}"
+                )
+
+        Path(options['output']).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Результати збережено у {options['output']}"))
+
+        if options['compare']:
+            self.compare(results, json.loads(Path(options['compare']).read_text()), options['threshold'])
+
+    def compare(self, current, previous, threshold):
+        regressions = []
+        for name, now in current['scenarios'].items():
+            before = previous.get('scenarios', {}).get(name)
+            if not before:
+                continue
+            for label, old, new in (
+                ('p95', before['latency_ms']['p95'], now['latency_ms']['p95']),
+                ('SQL', before['queries']['mean'], now['queries']['mean']),
+            ):
+                if old and (new - old) / old * 100 > threshold:
+                    regressions.append(f"{name}: {label} {old} → {new}")
+        if regressions:
+            raise CommandError("Регресії продуктивності:\n" + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS("Регресій не виявлено."))
@@ -0,0 +1,55 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from main.tasks import claim_jobs, init_worker_process, record_result, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Фоновий воркер обробки фото: бере завдання з таблиці ImageJob і виконує їх у пулі процесів."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Кількість процесів у пулі")
+        parser.add_argument('--poll', type=float, default=2.0, help="Пауза між перевірками черги, с")
+        parser.add_argument('--stale-after', type=int, default=15,
+                            help="Через скільки хвилин завдання в статусі 'running' вважається завислим")
+        parser.add_argument('--once', action='store_true', help="Обробити наявну чергу і завершитись")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(timedelta(minutes=options['stale_after']))
+        if requeued:
+            self.stdout.write(f"Повернуто в чергу завислих завдань: {requeued}")
+
+        # Перед fork закриваємо з’єднання, щоб дочірні процеси не ділили сокет/файл БД
+        connections.close_all()
+        done = failed = 0
+        # Явно fork: процеси пулу успадковують налаштований Django. За spawn (типово на macOS і
+        # Windows) свіжий інтерпретатор не зміг би навіть імпортувати main.tasks до django.setup()
+        with ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=init_worker_process,
+            mp_context=multiprocessing.get_context('fork'),
+        ) as pool:
+            while True:
+                jobs = claim_jobs(options['workers'] * 4)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+
+                futures = [pool.submit(run_job, *job) for job in jobs]
+                wait(futures)
+                for future in futures:
+                    job_id, error = future.result()
+                    record_result(job_id, error)
+                    if error is None:
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(f"Завдання #{job_id}: {error.strip().splitlines()[-1]}")
+
+        self.stdout.write(self.style.SUCCESS(f"Виконано: {done}, з помилкою: {failed}"))
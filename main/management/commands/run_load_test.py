@@ -0,0 +1,144 @@
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from main.perf import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний тест запущеного сервера (gunicorn з SERVER_PROFILE=wsgi або asgi): "
+        "багато паралельних клієнтів із keep-alive, пропускна здатність і затримки у JSON. "
+        "З --compare порівнює з результатом іншого профілю."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--label', default='server', help="Назва профілю в результатах (wsgi, asgi...)")
+        parser.add_argument('--concurrency', type=int, default=64, help="Паралельних клієнтів")
+        parser.add_argument('--requests', type=int, default=2000, help="Запитів на сценарій")
+        parser.add_argument('--session', help="sessionid персоналу для сценарію get_unread_count")
+        parser.add_argument('--only', nargs='*', help="Запустити лише вказані сценарії")
+        parser.add_argument('--output', help="Типово load_<label>.json")
+        parser.add_argument('--compare', help="JSON іншого профілю для порівняння")
+
+    def scenarios(self, session):
+        scenarios = {
+            'home': reverse('home'),
+            'catalog': reverse('catalog'),
+            'news_list': reverse('news'),
+            'search': reverse('search') + '?q=' + quote('банер'),
+        }
+        if session:
+            scenarios['get_unread_count'] = reverse('get_unread_count')
+        return scenarios
+
+    def run_scenario(self, base, path, total, concurrency, cookie):
+        local = threading.local()
+        counter = iter(range(total))
+        counter_lock = threading.Lock()
+        latencies, errors = [], []
+        results_lock = threading.Lock()
+        headers = {'Cookie': cookie} if cookie else {}
+
+        def client():
+            # Одне keep-alive з'єднання на клієнта, як у браузера
+            if getattr(local, 'conn', None) is None:
+                local.conn = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+            return local.conn
+
+        def worker():
+            while True:
+                with counter_lock:
+                    if next(counter, None) is None:
+                        return
+                t0 = time.perf_counter()
+                try:
+                    conn = client()
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException) as exc:
+                    local.conn = None
+                    status = repr(exc)
+                elapsed = (time.perf_counter() - t0) * 1000
+                with results_lock:
+                    if status == 200:
+                        latencies.append(elapsed)
+                    else:
+                        errors.append(status)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError(f"{path}: жодної успішної відповіді ({errors[:1]})")
+        latencies.sort()
+        return {
+            'url': path,
+            'requests': total,
+            'errors': len(errors),
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'latency_ms': {
+                'mean': round(statistics.fmean(latencies), 2),
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2),
+            },
+        }
+
+    def handle(self, *args, **options):
+        base = urlsplit(options['base_url'])
+        if base.scheme != 'http':
+            raise CommandError("Підтримується лише http://")
+        cookie = f"sessionid={options['session']}" if options['session'] else None
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'label': options['label'],
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'scenarios': {},
+        }
+        for name, path in self.scenarios(options['session']).items():
+            if options['only'] and name not in options['only']:
+                continue
+            result = self.run_scenario(base, path, options['requests'], options['concurrency'],
+                                       cookie if name == 'get_unread_count' else None)
+            results['scenarios'][name] = result
+            self.stdout.write(
+                f"{name:<18} {result['throughput_rps']:>9} req/s  p50 {result['latency_ms']['p50']:>8} ms  "
+                f"p99 {result['latency_ms']['p99']:>8} ms  помилок {result['errors']}"
+            )
+
+        output = options['output'] or f"load_{options['label']}.json"
+        Path(output).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Результати збережено у {output}"))
+
+        if options['compare']:
+            self.compare(results, json.loads(Path(options['compare']).read_text()))
+
+    def compare(self, current, other):
+        self.stdout.write(f"\n{current['label']} проти {other['label']}:")
+        for name, now in current['scenarios'].items():
+            before = other.get('scenarios', {}).get(name)
+            if not before:
+                continue
+            ratio = now['throughput_rps'] / before['throughput_rps'] if before['throughput_rps'] else 0
+            self.stdout.write(
+                f"{name:<18} {before['throughput_rps']:>9} → {now['throughput_rps']:>9} req/s (×{ratio:.2f})  "
+                f"p99 {before['latency_ms']['p99']} → {now['latency_ms']['p99']} ms"
+            )
@@ -0,0 +1,124 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from main.caching import bump_content_version
+from main.counters import reconcile_unread_count
+from main.models import News, Service, ServiceOrder, SupportChat, SupportConversation, UserProfile, make_excerpt
+from main.search import get_search_backend
+
+USER_PREFIX = 'bench_user_'
+STAFF_USERNAME = 'bench_staff'
+WORDS = (
+    "банер вивіска друк реклама дизайн макет логотип поліграфія буклет листівка наклейка "
+    "стенд плакат брендування фасад світлова конструкція монтаж оформлення вітрина сувенір "
+    "футболка чашка календар візитка каталог виставка акція знижка замовлення клієнт"
+).split()
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+class Command(BaseCommand):
+    help = (
+        "Заповнює базу великою кількістю тестових даних для бенчмарків "
+        "(користувачі, послуги, новини, замовлення, повідомлення чату)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--services', type=int, default=200)
+        parser.add_argument('--news', type=int, default=2000)
+        parser.add_argument('--orders', type=int, default=20000)
+        parser.add_argument('--messages', type=int, default=50000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42, help="Зерно генератора для відтворюваності")
+        parser.add_argument('--clear', action='store_true', help="Спершу видалити попередні бенчмарк-дані")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch = options['batch_size']
+        now = timezone.now()
+
+        if options['clear']:
+            deleted, _ = User.objects.filter(
+                Q(username__startswith=USER_PREFIX) | Q(username=STAFF_USERNAME)
+            ).delete()
+            self.stdout.write(f"Видалено записів: {deleted}")
+
+        # Один хеш на всіх: повільний хеш для кожного користувача зайняв би хвилини
+        password = make_password('bench-password')
+        start = User.objects.filter(username__startswith=USER_PREFIX).count()
+        with transaction.atomic():
+            staff, _ = User.objects.get_or_create(username=STAFF_USERNAME, defaults={
+                'email': f'{STAFF_USERNAME}@example.com', 'password': password, 'is_staff': True,
+            })
+            users = User.objects.bulk_create([
+                User(
+                    username=f'{USER_PREFIX}{start + i}',
+                    email=f'{USER_PREFIX}{start + i}@example.com',
+                    first_name=rng.choice(WORDS).capitalize(),
+                    last_name=rng.choice(WORDS).capitalize(),
+                    password=password,
+                    date_joined=now - timedelta(minutes=rng.randrange(525600)),
+                )
+                for i in range(options['users'])
+            ], batch_size=batch)
+            bench_users = User.objects.filter(username__startswith=USER_PREFIX)
+            user_ids = list(bench_users.values_list('id', flat=True))
+            UserProfile.objects.bulk_create([
+                UserProfile(user_id=user_id, phone=f'+380{rng.randrange(10 ** 9):09d}')
+                for user_id in bench_users.filter(profile__isnull=True).values_list('id', flat=True)
+            ], batch_size=batch)
+
+            # bulk_create оминає save(), тож короткий текст для карток рахуємо тут
+            Service.objects.bulk_create([
+                Service(title=title, description=text, excerpt=make_excerpt(text, Service.EXCERPT_WORDS))
+                for title, text in ((sentence(rng, 3), sentence(rng, 60)) for _ in range(options['services']))
+            ], batch_size=batch)
+            service_ids = list(Service.objects.values_list('id', flat=True))
+
+            News.objects.bulk_create([
+                News(title=title, content=text, excerpt=make_excerpt(text, News.EXCERPT_WORDS))
+                for title, text in ((sentence(rng, 5), sentence(rng, 200)) for _ in range(options['news']))
+            ], batch_size=batch)
+
+            if service_ids and user_ids:
+                ServiceOrder.objects.bulk_create([
+                    ServiceOrder(
+                        user_id=rng.choice(user_ids), service_id=rng.choice(service_ids),
+                        description=sentence(rng, 15),
+                    )
+                    for _ in range(options['orders'])
+                ], batch_size=batch)
+
+            if user_ids:
+                messages = []
+                for _ in range(options['messages']):
+                    owner = rng.choice(user_ids)
+                    from_admin = rng.random() < 0.4
+                    messages.append(SupportChat(
+                        user_id=owner, sender_id=staff.id if from_admin else owner,
+                        message=sentence(rng, rng.randrange(3, 30)),
+                        is_admin=from_admin, is_read=from_admin or rng.random() < 0.7,
+                    ))
+                SupportChat.objects.bulk_create(messages, batch_size=batch)
+
+        # bulk_create обходить сигнали — перебудовуємо похідні дані одним проходом
+        conversations = SupportConversation.rebuild_all(batch_size=batch)
+        indexed = get_search_backend().rebuild(batch_size=batch)
+        reconcile_unread_count()
+        bump_content_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово: користувачів {len(users)}, послуг {options['services']}, новин {options['news']}, "
+            f"замовлень {options['orders']}, повідомлень {options['messages']}; "
+            f"розмов {conversations}, у пошуковому індексі {indexed}"
+        ))
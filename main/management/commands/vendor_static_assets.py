@@ -0,0 +1,41 @@
+import base64
+import hashlib
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.staticfiles import VENDOR_ASSETS
+
+
+class Command(BaseCommand):
+    help = (
+        "Завантажує сторонні файли (Bootstrap) у static/vendor/ з перевіркою SRI-хешу, "
+        "щоб сайт не залежав від CDN. Файли слід закомітити."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Перезавантажити наявні файли")
+
+    def handle(self, *args, **options):
+        root = Path(settings.STATICFILES_DIRS[0])
+        for key, (path, url, integrity) in VENDOR_ASSETS.items():
+            target = root / path
+            if target.exists() and not options['force']:
+                self.stdout.write(f"{path}: вже є")
+                continue
+            try:
+                with urlopen(url, timeout=30) as response:
+                    data = response.read()
+            except OSError as exc:
+                raise CommandError(f"Не вдалося завантажити {url}: {exc}")
+            if integrity:
+                algorithm, expected = integrity.split('-', 1)
+                actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode()
+                if actual != expected:
+                    raise CommandError(f"{url}: SRI-хеш не збігається")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            self.stdout.write(f"{path}: {len(data)} байт")
+        self.stdout.write(self.style.SUCCESS("Готово. Далі: `manage.py collectstatic`."))
@@ -0,0 +1,140 @@
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from .perf import instrument_queries, instrument_templates, registry, start_profile, stop_profile
+from .staticfiles import StaticFilesIndex
+
+
+def accepted_encodings(header):
+    """Кодування з Accept-Encoding та їхні q-ваги; q=0 означає, що кодування заборонене."""
+    accepted = {}
+    for item in header.split(','):
+        name, *params = item.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        accepted[name] = weight
+    return accepted
+
+
+class PerfStatsMiddleware:
+    """
+    Для кожного url name з reklamnyresurs/urls.py рахує кількість SQL-запитів,
+    час SQL, час рендеру шаблонів і загальну тривалість запиту.
+    Звіт: /admin-perf/ (лише персонал) або `manage.py dump_perf_stats`.
+    Працює і під WSGI, і під ASGI без зайвого переходу в потік.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        instrument_queries()
+        instrument_templates()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile, token = start_profile()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_profile(token)
+        self.record(request, profile, start)
+        return response
+
+    async def __acall__(self, request):
+        profile, token = start_profile()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_profile(token)
+        self.record(request, profile, start)
+        return response
+
+    def record(self, request, profile, start):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name:
+            registry.record(match.url_name, profile, time.perf_counter() - start)
+
+
+class StaticFilesMiddleware:
+    """
+    Вбудований сервер статики для розгортання на одному сервері: віддає файли,
+    зібрані collectstatic у STATIC_ROOT, до сесій, URLconf і view. Підтримує
+    заздалегідь стиснуті .br/.gz, ETag/304 та immutable-кешування хешованих імен.
+    Вмикається STATIC_SERVE (типово, коли DEBUG вимкнено).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        root = settings.STATIC_ROOT
+        if not getattr(settings, 'STATIC_SERVE', not settings.DEBUG) or not root or not Path(root).is_dir():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        prefix = urlsplit(settings.STATIC_URL).path
+        self.prefix = prefix if prefix.startswith('/') else '/' + prefix
+        self.index = StaticFilesIndex(root, self.prefix)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.serve(request)
+        return response if response is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        # Файли невеликі й здебільшого в пам'яті, тож читаємо без переходу в потік
+        response = self.serve(request)
+        return response if response is not None else await self.get_response(request)
+
+    def serve(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path_info.startswith(self.prefix):
+            return None
+        static_file = self.index.lookup(request.path_info)
+        if static_file is None:
+            return None
+
+        if request.headers.get('If-None-Match') == static_file.etag:
+            response = HttpResponseNotModified()
+        else:
+            path, size, encoding = static_file.path, static_file.size, None
+            accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+            for name, (variant_path, variant_size) in static_file.variants.items():
+                if accepted.get(name, accepted.get('*', 0)) > 0:
+                    path, size, encoding = variant_path, variant_size, name
+                    break
+            body = b'' if request.method == 'HEAD' else self.index.read(path, size)
+            response = HttpResponse(body, content_type=static_file.content_type)
+            response['Content-Length'] = size
+            response['Last-Modified'] = static_file.last_modified
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = static_file.etag
+        response['Cache-Control'] = static_file.cache_control
+        if static_file.variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_conversations(apps, schema_editor):
+    SupportChat = apps.get_model('main', 'SupportChat')
+    SupportConversation = apps.get_model('main', 'SupportConversation')
+
+    # Один прохід по таблиці повідомлень замість запиту на кожного користувача
+    summaries = {}
+    messages = (
+        SupportChat.objects
+        .order_by('user_id', 'created_at', 'id')
+        .values_list('user_id', 'message', 'created_at', 'is_admin', 'is_read')
+    )
+    for user_id, message, created_at, is_admin, is_read in messages.iterator(chunk_size=2000):
+        summary = summaries.setdefault(user_id, {'unread_count': 0})
+        summary['last_message'] = message[:50] + ('...' if len(message) > 50 else '')
+        summary['last_time'] = created_at
+        if not is_admin and not is_read:
+            summary['unread_count'] += 1
+
+    SupportConversation.objects.bulk_create(
+        [SupportConversation(user_id=user_id, **summary) for user_id, summary in summaries.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('main', '0008_supportchat_is_read'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupportConversation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='support_conversation', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+                ('last_message', models.CharField(max_length=53, verbose_name='Останнє повідомлення')),
+                ('last_time', models.DateTimeField(verbose_name='Час останнього повідомлення')),
+                ('unread_count', models.PositiveIntegerField(default=0, verbose_name='Непрочитані')),
+            ],
+            options={
+                'verbose_name': 'Розмова з підтримкою',
+                'verbose_name_plural': 'Розмови з підтримкою',
+                'ordering': ['-last_time', '-user_id'],
+                'indexes': [models.Index(fields=['-last_time', '-user'], name='conversation_inbox_idx')],
+            },
+        ),
+        migrations.RunPython(build_conversations, migrations.RunPython.noop),
+    ]
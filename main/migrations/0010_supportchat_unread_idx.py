@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_admin_messages_read(apps, schema_editor):
+    # Відповіді адміністраторів більше не рахуються непрочитаними
+    SupportChat = apps.get_model('main', 'SupportChat')
+    SupportChat.objects.filter(is_admin=True, is_read=False).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_supportconversation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportchat',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user'], name='supportchat_unread_idx'),
+        ),
+        migrations.RunPython(mark_admin_messages_read, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+FTS_TABLE = 'main_search_index'
+
+
+def create_search_index(apps, schema_editor):
+    # Віртуальна таблиця FTS5 існує лише на SQLite; інші бази використовують SimpleSearchBackend
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    # rowid = id * 2 + позиція моделі (0 — послуги, 1 — новини), див. main/search.py
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, body) "
+        "SELECT id * 2, title, description FROM main_service"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, body) "
+        "SELECT id * 2 + 1, title, content FROM main_news"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_supportchat_unread_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='Модель')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name="ID об'єкта")),
+                ('field_name', models.CharField(default='image', max_length=50, verbose_name='Поле')),
+                ('status', models.CharField(choices=[('pending', 'Очікує'), ('running', 'Виконується'), ('done', 'Готово'), ('failed', 'Помилка')], default='pending', max_length=10, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Спроби')),
+                ('last_error', models.TextField(blank=True, verbose_name='Остання помилка')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Не раніше')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+            ],
+            options={
+                'verbose_name': 'Завдання обробки фото',
+                'verbose_name_plural': 'Завдання обробки фото',
+                'indexes': [models.Index(fields=['status', 'run_after'], name='imagejob_due_idx')],
+            },
+        ),
+    ]
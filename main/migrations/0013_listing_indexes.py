@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_imagejob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['-date', '-id'], name='news_date_idx'),
+        ),
+        # Таблиця auth_user належить django.contrib.auth, тому індекс для
+        # keyset-пагінації списку користувачів створюємо напряму
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS main_user_joined_idx ON auth_user (date_joined, id)',
+            'DROP INDEX IF EXISTS main_user_joined_idx',
+        ),
+    ]
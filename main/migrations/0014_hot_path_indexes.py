@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serviceorder',
+            index=models.Index(fields=['user', '-created_at'], name='serviceorder_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceorder',
+            index=models.Index(fields=['-created_at'], name='serviceorder_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportchat',
+            index=models.Index(fields=['user', 'created_at'], name='supportchat_thread_idx'),
+        ),
+    ]
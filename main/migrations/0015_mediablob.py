@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Розмір, байт')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='Посилань')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Створено')),
+            ],
+            options={
+                'verbose_name': 'Медіафайл',
+                'verbose_name_plural': 'Медіафайли',
+            },
+        ),
+    ]
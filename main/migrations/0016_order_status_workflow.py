@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# Вільний текст статусу -> код зі STATUS_CHOICES
+LEGACY_STATUSES = {
+    'Нове': 'new',
+    'В роботі': 'in_progress',
+    'Виконано': 'done',
+    'Завершено': 'done',
+    'Скасовано': 'cancelled',
+}
+LABELS = {'new': 'Нове', 'in_progress': 'В роботі', 'done': 'Виконано', 'cancelled': 'Скасовано'}
+
+
+def statuses_to_codes(apps, schema_editor):
+    ServiceOrder = apps.get_model('main', 'ServiceOrder')
+    for legacy, code in LEGACY_STATUSES.items():
+        ServiceOrder.objects.filter(status=legacy).update(status=code)
+    # Інші значення шаблони показували як виконані
+    ServiceOrder.objects.exclude(status__in=LABELS).update(status='done')
+
+
+def codes_to_statuses(apps, schema_editor):
+    ServiceOrder = apps.get_model('main', 'ServiceOrder')
+    for code, label in LABELS.items():
+        ServiceOrder.objects.filter(status=code).update(status=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_mediablob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceOrderHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('new', 'Нове'), ('in_progress', 'В роботі'), ('done', 'Виконано'), ('cancelled', 'Скасовано')], max_length=20, verbose_name='Був статус')),
+                ('to_status', models.CharField(choices=[('new', 'Нове'), ('in_progress', 'В роботі'), ('done', 'Виконано'), ('cancelled', 'Скасовано')], max_length=20, verbose_name='Новий статус')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Час зміни')),
+            ],
+            options={
+                'verbose_name': 'Зміна статусу замовлення',
+                'verbose_name_plural': 'Історія статусів замовлень',
+                'ordering': ['-changed_at', '-id'],
+            },
+        ),
+        migrations.RunPython(statuses_to_codes, codes_to_statuses),
+        migrations.AlterField(
+            model_name='serviceorder',
+            name='status',
+            field=models.CharField(choices=[('new', 'Нове'), ('in_progress', 'В роботі'), ('done', 'Виконано'), ('cancelled', 'Скасовано')], default='new', max_length=20, verbose_name='Статус'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceorder',
+            index=models.Index(fields=['status', '-created_at'], name='serviceorder_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='serviceorderhistory',
+            name='changed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Змінив'),
+        ),
+        migrations.AddField(
+            model_name='serviceorderhistory',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='main.serviceorder', verbose_name='Замовлення'),
+        ),
+        migrations.AddIndex(
+            model_name='serviceorderhistory',
+            index=models.Index(fields=['order', '-changed_at'], name='orderhistory_order_idx'),
+        ),
+    ]
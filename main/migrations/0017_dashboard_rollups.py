@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_order_status_workflow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='День')),
+                ('new_users', models.PositiveIntegerField(default=0, verbose_name='Нових користувачів')),
+                ('responses', models.PositiveIntegerField(default=0, verbose_name='Відповідей підтримки')),
+                ('response_seconds', models.FloatField(default=0, verbose_name='Сумарний час очікування, с')),
+            ],
+            options={
+                'verbose_name': 'Статистика за день',
+                'verbose_name_plural': 'Статистика за днями',
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderStatusStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('new', 'Нове'), ('in_progress', 'В роботі'), ('done', 'Виконано'), ('cancelled', 'Скасовано')], max_length=20, unique=True, verbose_name='Статус')),
+                ('orders', models.IntegerField(default=0, verbose_name='Замовлень')),
+            ],
+            options={
+                'verbose_name': 'Замовлення за статусом',
+                'verbose_name_plural': 'Замовлення за статусами',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True, verbose_name='Джерело')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Останній врахований id')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Оновлено')),
+            ],
+            options={
+                'verbose_name': 'Позначка зведень',
+                'verbose_name_plural': 'Позначки зведень',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyServiceStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('orders', models.PositiveIntegerField(default=0, verbose_name='Замовлень')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main.service', verbose_name='Послуга')),
+            ],
+            options={
+                'verbose_name': 'Замовлення послуги за день',
+                'verbose_name_plural': 'Замовлення послуг за днями',
+                'constraints': [models.UniqueConstraint(fields=('day', 'service'), name='dailyservicestat_day_service_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:04
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+# (модель, поле з текстом, слів) — як EXCERPT_SOURCE / EXCERPT_WORDS у моделях
+EXCERPTS = (('Service', 'description', 20), ('News', 'content', 25))
+
+
+def fill_excerpts(apps, schema_editor):
+    for model_name, source, words in EXCERPTS:
+        model = apps.get_model('main', model_name)
+        batch = []
+        for obj in model.objects.only('pk', source).iterator(chunk_size=500):
+            obj.excerpt = Truncator(Truncator(getattr(obj, source) or '').words(words, truncate=' …')).chars(300)
+            batch.append(obj)
+            if len(batch) == 500:
+                model.objects.bulk_update(batch, ['excerpt'])
+                batch = []
+        model.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0017_dashboard_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Короткий текст'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Короткий опис'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
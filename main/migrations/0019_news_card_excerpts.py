@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+from django.db import migrations
+from django.utils.text import Truncator
+
+# Картки новин і головна показують однаково — 20 слів (ExcerptMixin.EXCERPT_WORDS)
+WORDS = 20
+
+
+def refill_news_excerpts(apps, schema_editor):
+    News = apps.get_model('main', 'News')
+    batch = []
+    for obj in News.objects.only('pk', 'content').iterator(chunk_size=500):
+        obj.excerpt = Truncator(Truncator(obj.content or '').words(WORDS, truncate=' …')).chars(300)
+        batch.append(obj)
+        if len(batch) == 500:
+            News.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    News.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0018_listing_excerpts'),
+    ]
+
+    operations = [
+        migrations.RunPython(refill_news_excerpts, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,50 @@
+from collections import defaultdict
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .counters import adjust_unread_count
+from .db import serialized_write
+
+MARK_READ_BATCH_SIZE = 500
+CHAT_PAGE_SIZE = 30
+# Розмір пакета для масової зміни статусів замовлень (ліміт параметрів SQLite)
+STATUS_BATCH_SIZE = 500
+EXCERPT_MAX_LENGTH = 300
+
+
+def make_excerpt(text, words):
+    """Короткий текст для карток — те саме, що дав би фільтр truncatewords."""
+    return Truncator(Truncator(text or '').words(words, truncate=' …')).chars(EXCERPT_MAX_LENGTH)
+
+
+class ExcerptMixin:
+    """
+    🔹 Зберігає excerpt разом із моделлю, щоб списки не читали повний текст:
+    вони вибирають лише потрібні колонки через .only(LIST_FIELDS).
+    """
+    EXCERPT_SOURCE = None
+    EXCERPT_WORDS = 20
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.EXCERPT_SOURCE in update_fields:
+            self.excerpt = make_excerpt(getattr(self, self.EXCERPT_SOURCE), self.EXCERPT_WORDS)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
+class Service(ExcerptMixin, models.Model):
+    EXCERPT_SOURCE = 'description'
+    LIST_FIELDS = ('id', 'title', 'image', 'excerpt')
 
-class Service(models.Model):
     title = models.CharField(max_length=200, verbose_name="Назва послуги")
     description = models.TextField(verbose_name="Опис")
+    excerpt = models.CharField(max_length=EXCERPT_MAX_LENGTH, blank=True, editable=False, verbose_name="Короткий опис")
     image = models.ImageField(upload_to='services/', blank=True, null=True, verbose_name="Фото")
 
     def __str__(self):
@@ -15,9 +55,13 @@ class Service(models.Model):
         verbose_name_plural = "Послуги"
 
 
-class News(models.Model):
+class News(ExcerptMixin, models.Model):
+    EXCERPT_SOURCE = 'content'
+    LIST_FIELDS = ('id', 'title', 'image', 'date', 'excerpt')
+
     title = models.CharField(max_length=200, verbose_name="Заголовок")
     content = models.TextField(verbose_name="Текст новини")
+    excerpt = models.CharField(max_length=EXCERPT_MAX_LENGTH, blank=True, editable=False, verbose_name="Короткий текст")
     image = models.ImageField(upload_to='news/', blank=True, null=True, verbose_name="Фото")
     date = models.DateTimeField(auto_now_add=True, verbose_name="Дата публікації")
 
@@ -27,6 +71,9 @@ class News(models.Model):
     class Meta:
         verbose_name = "Новина"
         verbose_name_plural = "Новини"
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='news_date_idx'),
+        ]
 
 
 class Contact(models.Model):
@@ -69,18 +116,101 @@ class SupportChat(models.Model):
     def __str__(self):
         return f"Повідомлення від {self.sender.username} → {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        # Відповідь адміністратора не потребує прочитання персоналом
+        if self._state.adding and self.is_admin:
+            self.is_read = True
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def post(cls, user_id, sender, text, is_admin):
+        """Створює повідомлення разом з оновленням підсумку розмови в одній транзакції запису."""
+        with serialized_write():
+            return cls.objects.create(user_id=user_id, sender=sender, message=text, is_admin=is_admin)
+
+    @classmethod
+    def thread_window(cls, user_id, before=None, after=None, limit=CHAT_PAGE_SIZE):
+        """
+        Порція повідомлень розмови у хронологічному порядку та ознака, чи є
+        старіші. Без курсора — останні ``limit`` повідомлень; ``before``/``after``
+        — id повідомлення, від якого підвантажуємо старіші або новіші.
+        """
+        thread = cls.objects.filter(user_id=user_id)
+        if after is not None:
+            return list(thread.filter(id__gt=after).order_by('id')[:limit]), None
+        if before is not None:
+            thread = thread.filter(id__lt=before)
+        window = list(thread.order_by('-id')[:limit + 1])
+        has_more = len(window) > limit
+        return window[:limit][::-1], has_more
+
+    @classmethod
+    def mark_thread_read(cls, user_id, batch_size=MARK_READ_BATCH_SIZE):
+        """
+        Позначає прочитаними непрочитані повідомлення однієї розмови невеликими
+        пакетами, щоб не тримати блокування запису SQLite довше, ніж потрібно.
+        Лічильники зменшуються рівно на кількість реально оновлених рядків, тому
+        кілька адміністраторів, що одночасно відкрили чат, не рахують двічі.
+        """
+        unread = cls.objects.filter(user_id=user_id, is_read=False)
+        total = 0
+        while True:
+            ids = list(unread.order_by().values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            with serialized_write():
+                marked = cls.objects.filter(id__in=ids, is_read=False).update(is_read=True)
+                if marked:
+                    SupportConversation.objects.filter(user_id=user_id).update(
+                        unread_count=Greatest(models.F('unread_count') - marked, 0),
+                    )
+            total += marked
+            if len(ids) < batch_size:
+                break
+
+        adjust_unread_count(-total)
+        return total
+
     class Meta:
         verbose_name = "Повідомлення чату"
         verbose_name_plural = "Чат підтримки"
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='supportchat_thread_idx'),
+            models.Index(fields=['user'], condition=models.Q(is_read=False), name='supportchat_unread_idx'),
+        ]
 
 
 class ServiceOrder(models.Model):
+    NEW = 'new'
+    IN_PROGRESS = 'in_progress'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (NEW, "Нове"),
+        (IN_PROGRESS, "В роботі"),
+        (DONE, "Виконано"),
+        (CANCELLED, "Скасовано"),
+    ]
+    # 🔹 Дозволені переходи між статусами
+    TRANSITIONS = {
+        NEW: (IN_PROGRESS, CANCELLED),
+        IN_PROGRESS: (DONE, CANCELLED),
+        DONE: (),
+        CANCELLED: (NEW,),
+    }
+    STATUS_BADGES = {
+        NEW: 'bg-warning text-dark',
+        IN_PROGRESS: 'bg-info',
+        DONE: 'bg-success',
+        CANCELLED: 'bg-secondary',
+    }
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="service_orders", verbose_name="Користувач")
     service = models.ForeignKey(Service, on_delete=models.CASCADE, verbose_name="Послуга")
     description = models.TextField(verbose_name="Додаткова інформація", blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата замовлення")
-    status = models.CharField(max_length=50, default="Нове", verbose_name="Статус")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=NEW, verbose_name="Статус")
 
     def __str__(self):
         return f"{self.user.username} → {self.service.title}"
@@ -88,6 +218,81 @@ class ServiceOrder(models.Model):
     class Meta:
         verbose_name = "Замовлення послуги"
         verbose_name_plural = "Замовлення послуг"
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='serviceorder_user_idx'),
+            models.Index(fields=['-created_at'], name='serviceorder_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='serviceorder_status_idx'),
+        ]
+
+    @property
+    def status_badge(self):
+        return self.STATUS_BADGES.get(self.status, 'bg-secondary')
+
+    def allowed_transitions(self):
+        labels = dict(self.STATUS_CHOICES)
+        return [(status, labels[status]) for status in self.TRANSITIONS.get(self.status, ())]
+
+    @classmethod
+    def bulk_transition(cls, orders, to_status, changed_by=None, batch_size=STATUS_BATCH_SIZE):
+        """
+        Переводить замовлення з ``orders`` (queryset) у ``to_status`` одним UPDATE на
+        пакет і вихідний статус та пише історію через bulk_create. Замовлення, для яких перехід не
+        дозволений, пропускаються. Повертає кількість змінених замовлень.
+        """
+        allowed_from = [status for status, targets in cls.TRANSITIONS.items() if to_status in targets]
+        now = timezone.now()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        changed = []
+        with serialized_write():
+            rows = list(orders.filter(status__in=allowed_from).select_for_update().values_list('pk', 'status'))
+            for start in range(0, len(rows), batch_size):
+                by_status = defaultdict(list)
+                for pk, status in rows[start:start + batch_size]:
+                    by_status[status].append(pk)
+                for from_status, ids in by_status.items():
+                    # UPDATE ще раз перевіряє статус: рядок, який інший процес змінив після SELECT,
+                    # не перезаписується, а RETURNING дає саме змінені рядки для історії
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            f'UPDATE {table} SET status = %s WHERE id IN ({", ".join(["%s"] * len(ids))}) '
+                            f'AND status = %s RETURNING id',
+                            [to_status, *ids, from_status],
+                        )
+                        changed += [(pk, from_status) for pk, in cursor.fetchall()]
+            ServiceOrderHistory.objects.bulk_create([
+                ServiceOrderHistory(order_id=pk, from_status=status, to_status=to_status,
+                                    changed_by=changed_by, changed_at=now)
+                for pk, status in changed
+            ], batch_size=batch_size)
+        return len(changed)
+
+    def transition_to(self, to_status, changed_by=None):
+        """Один перехід через той самий шлях, що й масовий; True, якщо статус змінено."""
+        changed = ServiceOrder.bulk_transition(ServiceOrder.objects.filter(pk=self.pk), to_status, changed_by)
+        if changed:
+            self.status = to_status
+        return bool(changed)
+
+
+class ServiceOrderHistory(models.Model):
+    """Журнал змін статусу замовлень (хто, коли, з якого статусу в який)."""
+    order = models.ForeignKey(ServiceOrder, on_delete=models.CASCADE, related_name='history', verbose_name="Замовлення")
+    from_status = models.CharField(max_length=20, choices=ServiceOrder.STATUS_CHOICES, verbose_name="Був статус")
+    to_status = models.CharField(max_length=20, choices=ServiceOrder.STATUS_CHOICES, verbose_name="Новий статус")
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+                                   verbose_name="Змінив")
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name="Час зміни")
+
+    def __str__(self):
+        return f"#{self.order_id}: {self.from_status} → {self.to_status}"
+
+    class Meta:
+        verbose_name = "Зміна статусу замовлення"
+        verbose_name_plural = "Історія статусів замовлень"
+        ordering = ['-changed_at', '-id']
+        indexes = [
+            models.Index(fields=['order', '-changed_at'], name='orderhistory_order_idx'),
+        ]
 
 
 class UserProfile(models.Model):
@@ -96,3 +301,208 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return self.user.username
+
+
+class SupportConversation(models.Model):
+    """Денормалізований підсумок розмови з підтримкою (один рядок на користувача)."""
+    PREVIEW_LENGTH = 50
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                related_name='support_conversation', verbose_name="Користувач")
+    last_message = models.CharField(max_length=PREVIEW_LENGTH + 3, verbose_name="Останнє повідомлення")
+    last_time = models.DateTimeField(verbose_name="Час останнього повідомлення")
+    unread_count = models.PositiveIntegerField(default=0, verbose_name="Непрочитані")
+
+    def __str__(self):
+        return f"Розмова з {self.user.username}"
+
+    @classmethod
+    def make_preview(cls, text):
+        return text[:cls.PREVIEW_LENGTH] + ('...' if len(text) > cls.PREVIEW_LENGTH else '')
+
+    @classmethod
+    def register_message(cls, msg):
+        """Оновлює підсумок після створення нового повідомлення (без читання всієї історії)."""
+        unread = 0 if msg.is_admin or msg.is_read else 1
+        updated = cls.objects.filter(user_id=msg.user_id).update(
+            last_message=cls.make_preview(msg.message),
+            last_time=msg.created_at,
+            unread_count=models.F('unread_count') + unread,
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    cls.objects.create(
+                        user_id=msg.user_id,
+                        last_message=cls.make_preview(msg.message),
+                        last_time=msg.created_at,
+                        unread_count=unread,
+                    )
+            except IntegrityError:
+                # Паралельний запит встиг створити рядок — просто оновлюємо його
+                cls.register_message(msg)
+
+    @classmethod
+    def rebuild_for(cls, user_id):
+        """Перераховує підсумок однієї розмови з таблиці повідомлень."""
+        last_msg = SupportChat.objects.filter(user_id=user_id).order_by('-created_at', '-id').first()
+        if last_msg is None:
+            cls.objects.filter(user_id=user_id).delete()
+            return
+        unread = SupportChat.objects.filter(user_id=user_id, is_admin=False, is_read=False).count()
+        cls.objects.update_or_create(user_id=user_id, defaults={
+            'last_message': cls.make_preview(last_msg.message),
+            'last_time': last_msg.created_at,
+            'unread_count': unread,
+        })
+
+    @classmethod
+    def rebuild_all(cls, batch_size=1000):
+        """Перебудовує всі підсумки одним проходом по таблиці (після bulk-імпорту)."""
+        summaries = {}
+        messages = (
+            SupportChat.objects
+            .order_by('user_id', 'created_at', 'id')
+            .values_list('user_id', 'message', 'created_at', 'is_admin', 'is_read')
+        )
+        for user_id, message, created_at, is_admin, is_read in messages.iterator(chunk_size=batch_size):
+            summary = summaries.setdefault(user_id, cls(user_id=user_id, unread_count=0))
+            summary.last_message = cls.make_preview(message)
+            summary.last_time = created_at
+            if not is_admin and not is_read:
+                summary.unread_count += 1
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(summaries.values(), batch_size=batch_size)
+        return len(summaries)
+
+    class Meta:
+        verbose_name = "Розмова з підтримкою"
+        verbose_name_plural = "Розмови з підтримкою"
+        ordering = ['-last_time', '-user_id']
+        indexes = [
+            models.Index(fields=['-last_time', '-user'], name='conversation_inbox_idx'),
+        ]
+
+
+class ImageJob(models.Model):
+    """Черга фонової обробки фото (див. main/tasks.py та `manage.py run_image_worker`)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, "Очікує"),
+        (RUNNING, "Виконується"),
+        (DONE, "Готово"),
+        (FAILED, "Помилка"),
+    ]
+
+    model_label = models.CharField(max_length=100, verbose_name="Модель")
+    object_id = models.PositiveBigIntegerField(verbose_name="ID об'єкта")
+    field_name = models.CharField(max_length=50, default='image', verbose_name="Поле")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="Статус")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Спроби")
+    last_error = models.TextField(blank=True, verbose_name="Остання помилка")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Не раніше")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field_name} ({self.status})"
+
+    class Meta:
+        verbose_name = "Завдання обробки фото"
+        verbose_name_plural = "Завдання обробки фото"
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='imagejob_due_idx'),
+        ]
+
+
+class MediaBlob(models.Model):
+    """
+    Файл у контентно-адресованому сховищі (main/storage.py): однакові завантаження
+    зберігаються один раз, а refcount — скільки полів моделей на нього посилаються.
+    """
+    name = models.CharField(max_length=255, unique=True, verbose_name="Файл")
+    size = models.PositiveBigIntegerField(verbose_name="Розмір, байт")
+    refcount = models.PositiveIntegerField(default=0, verbose_name="Посилань")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
+    class Meta:
+        verbose_name = "Медіафайл"
+        verbose_name_plural = "Медіафайли"
+
+    @classmethod
+    def acquire(cls, name, size):
+        """Ще одне посилання на файл (нове завантаження того самого вмісту)."""
+        with serialized_write():
+            if not cls.objects.filter(name=name).update(refcount=models.F('refcount') + 1):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(name=name, size=size, refcount=1)
+                except IntegrityError:
+                    cls.objects.filter(name=name).update(refcount=models.F('refcount') + 1)
+
+    @classmethod
+    def release(cls, name):
+        """Знімає посилання; повертає True, якщо посилань не лишилось і файл можна видалити."""
+        with serialized_write():
+            cls.objects.filter(name=name, refcount__gt=0).update(refcount=models.F('refcount') - 1)
+            deleted, _ = cls.objects.filter(name=name, refcount=0).delete()
+        return bool(deleted)
+
+
+class DailyServiceStat(models.Model):
+    """Зведення для панелі (main/rollups.py): замовлення послуги за день."""
+    day = models.DateField(verbose_name="День")
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='+', verbose_name="Послуга")
+    orders = models.PositiveIntegerField(default=0, verbose_name="Замовлень")
+
+    class Meta:
+        verbose_name = "Замовлення послуги за день"
+        verbose_name_plural = "Замовлення послуг за днями"
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'service'], name='dailyservicestat_day_service_uniq'),
+        ]
+
+
+class DailyStat(models.Model):
+    """Зведення для панелі: нові користувачі та відповіді підтримки за день."""
+    day = models.DateField(unique=True, verbose_name="День")
+    new_users = models.PositiveIntegerField(default=0, verbose_name="Нових користувачів")
+    responses = models.PositiveIntegerField(default=0, verbose_name="Відповідей підтримки")
+    response_seconds = models.FloatField(default=0, verbose_name="Сумарний час очікування, с")
+
+    class Meta:
+        verbose_name = "Статистика за день"
+        verbose_name_plural = "Статистика за днями"
+
+    @property
+    def avg_response_seconds(self):
+        return self.response_seconds / self.responses if self.responses else None
+
+
+class OrderStatusStat(models.Model):
+    """Зведення для панелі: кількість замовлень у кожному статусі."""
+    status = models.CharField(max_length=20, choices=ServiceOrder.STATUS_CHOICES, unique=True, verbose_name="Статус")
+    orders = models.IntegerField(default=0, verbose_name="Замовлень")
+
+    class Meta:
+        verbose_name = "Замовлення за статусом"
+        verbose_name_plural = "Замовлення за статусами"
+
+
+class RollupWatermark(models.Model):
+    """До якого id кожне джерело вже враховане у зведеннях (інкрементне оновлення)."""
+    source = models.CharField(max_length=50, unique=True, verbose_name="Джерело")
+    last_id = models.BigIntegerField(default=0, verbose_name="Останній врахований id")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+
+    class Meta:
+        verbose_name = "Позначка зведень"
+        verbose_name_plural = "Позначки зведень"
@@ -0,0 +1,112 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class KeysetPage:
+    """Одна сторінка keyset-пагінації: елементи та курсор наступної сторінки."""
+
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder обрізає час до мілісекунд, а курсор має зберігати точне
+    значення: інакше рядок на межі сторінки повторюється або губиться.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), cls=CursorEncoder)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Повертає список значень курсора або None, якщо курсор пошкоджений."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _field_value(item, name):
+    if isinstance(item, dict):
+        return item[name]
+    return getattr(item, name)
+
+
+def _keyset_queryset(queryset, ordering, cursor, per_page):
+    names = [field.lstrip('-') for field in ordering]
+    values = decode_cursor(cursor)
+
+    if values is not None and len(values) == len(names):
+        model = queryset.model
+        parsed = []
+        for name, value in zip(names, values):
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # Анотації — беремо значення як є
+                parsed.append(value)
+            else:
+                parsed.append(field.to_python(value) if value is not None else None)
+
+        condition = Q()
+        for i, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{names[i]}__{lookup}': parsed[i]})
+            for j in range(i):
+                step &= Q(**{names[j]: parsed[j]})
+            condition |= step
+        queryset = queryset.filter(condition)
+
+    return queryset.order_by(*ordering)[:per_page + 1], names
+
+
+def _build_page(items, names, per_page):
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor(_field_value(items[-1], name) for name in names)
+    return KeysetPage(items, next_cursor)
+
+
+def keyset_paginate(queryset, ordering, cursor=None, per_page=20):
+    """
+    Пагінація за курсором замість OFFSET: наступна сторінка починається
+    одразу після останнього рядка попередньої, тож вартість запиту не росте
+    разом із номером сторінки. ``ordering`` має завершуватися унікальним полем.
+    """
+    queryset, names = _keyset_queryset(queryset, ordering, cursor, per_page)
+    return _build_page(list(queryset), names, per_page)
+
+
+async def akeyset_paginate(queryset, ordering, cursor=None, per_page=20):
+    """Асинхронний варіант keyset_paginate для async view (async-ітерація ORM)."""
+    queryset, names = _keyset_queryset(queryset, ordering, cursor, per_page)
+    return _build_page([item async for item in queryset], names, per_page)
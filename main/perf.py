@@ -0,0 +1,256 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('main.perf')
+
+_current = ContextVar('perf_profile', default=None)
+
+_NUMBER = re.compile(r'\b\d+(\.\d+)?\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """«Форма» запиту без конкретних значень — однакові форми в одному запиті означають N+1."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return sql.replace('%s', '?')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: рахуємо кожен SQL-запит поточного запиту
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    def repeated_shapes(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.items() if count > threshold]
+
+
+def _profile_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if _profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_profile_query)
+
+
+def instrument_queries():
+    """
+    Лічильник SQL на кожному з'єднанні. Профіль береться з ContextVar, тож запити
+    враховуються і в потоках, де async ORM виконує sync_to_async.
+    """
+    connection_created.connect(_install_query_wrapper, dispatch_uid='main.perf.instrument_queries')
+    for conn in connections.all(initialized_only=True):
+        _install_query_wrapper(None, conn)
+
+
+def current_profile():
+    return _current.get()
+
+
+def start_profile():
+    profile = RequestProfile()
+    return profile, _current.set(profile)
+
+
+def stop_profile(token):
+    _current.reset(token)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Метод найближчого рангу
+    index = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(samples, n_plus_one, requests):
+    """Зведення для одного view: кількість, середні значення та p50/p95/p99 (мс)."""
+    summary = {'requests': requests, 'n_plus_one_requests': n_plus_one}
+    for metric in ('total_ms', 'sql_ms', 'template_ms', 'queries'):
+        values = sorted(sample[metric] for sample in samples)
+        summary[metric] = {
+            'avg': round(sum(values) / len(values), 2) if values else 0.0,
+            'p50': round(percentile(values, 50), 2),
+            'p95': round(percentile(values, 95), 2),
+            'p99': round(percentile(values, 99), 2),
+        }
+    return summary
+
+
+class StatsRegistry:
+    """
+    Ковзні вікна вимірювань для кожного url name у межах процесу. Знімок
+    періодично пишеться у PERF_STATS_DIR/<pid>.json, щоб команда
+    `dump_perf_stats` і endpoint могли об’єднати дані всіх воркерів.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=_setting('PERF_STATS_WINDOW', 1000)))
+        self._requests = Counter()
+        self._n_plus_one = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, name, profile, total):
+        sample = {
+            'total_ms': total * 1000,
+            'sql_ms': profile.sql_time * 1000,
+            'template_ms': profile.template_time * 1000,
+            'queries': profile.queries,
+        }
+        repeated = profile.repeated_shapes(_setting('PERF_STATS_N_PLUS_ONE_THRESHOLD', 10))
+        with self._lock:
+            self._samples[name].append(sample)
+            self._requests[name] += 1
+            if repeated:
+                self._n_plus_one[name] += 1
+        if repeated:
+            shape, count = max(repeated, key=lambda item: item[1])
+            logger.warning("Можливий N+1 у %s: запит повторився %s разів: %s", name, count, shape[:300])
+        if time.monotonic() - self._last_flush > _setting('PERF_STATS_FLUSH_SECONDS', 30):
+            self.flush()
+
+    def raw(self):
+        with self._lock:
+            return {
+                name: {
+                    'samples': list(samples),
+                    'requests': self._requests[name],
+                    'n_plus_one': self._n_plus_one[name],
+                }
+                for name, samples in self._samples.items()
+            }
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        data = self.raw()
+        if not data:
+            # Процес без запитів (напр. сама команда dump_perf_stats) файлу не лишає
+            return
+        directory = _stats_dir()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = directory / f'{os.getpid()}.json.tmp'
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, directory / f'{os.getpid()}.json')
+        except OSError:
+            logger.exception("Не вдалося записати статистику продуктивності")
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._requests.clear()
+            self._n_plus_one.clear()
+
+
+registry = StatsRegistry()
+
+
+def _stats_dir():
+    return Path(_setting('PERF_STATS_DIR', settings.BASE_DIR / 'perf'))
+
+
+def _pid_alive(pid):
+    if os.name != 'posix':
+        # На Windows os.kill(pid, 0) надсилає CTRL_C_EVENT — такі файли прибирає reset_stats()
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reset_stats():
+    """Видаляє знімки всіх процесів і скидає статистику поточного."""
+    registry.clear()
+    for path in _stats_dir().glob('*.json'):
+        path.unlink(missing_ok=True)
+
+
+def collect_stats():
+    """Об’єднує знімки живих процесів (разом із поточним) у звіт по view."""
+    registry.flush()
+    merged = defaultdict(lambda: {'samples': [], 'requests': 0, 'n_plus_one': 0})
+    for path in _stats_dir().glob('*.json'):
+        # Знімки завершених процесів (перезапуск, max_requests) видаляються, а не накопичуються
+        if path.stem.isdigit() and int(path.stem) != os.getpid() and not _pid_alive(int(path.stem)):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for name, entry in data.items():
+            merged[name]['samples'].extend(entry['samples'])
+            merged[name]['requests'] += entry['requests']
+            merged[name]['n_plus_one'] += entry['n_plus_one']
+    return {
+        name: summarize(entry['samples'], entry['n_plus_one'], entry['requests'])
+        for name, entry in sorted(merged.items())
+    }
+
+
+_instrumented = False
+_instrument_lock = threading.Lock()
+
+
+def instrument_templates():
+    """Один раз обгортає рендер шаблонів Django, щоб вимірювати його час."""
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return
+        from django.template.backends.django import Template
+
+        original_render = Template.render
+
+        def render(self, context=None, request=None):
+            profile = _current.get()
+            if profile is None:
+                return original_render(self, context, request)
+            start = time.perf_counter()
+            try:
+                return original_render(self, context, request)
+            finally:
+                profile.template_time += time.perf_counter() - start
+
+        Template.render = render
+        _instrumented = True
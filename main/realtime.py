@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateformat import format as date_format
+from django.utils.module_loading import import_string
+
+from .counters import unread_count
+
+UNREAD_TOPIC = 'support.unread'
+
+
+def conversation_topic(user_id):
+    return f'support.chat.{user_id}'
+
+
+class Subscription:
+    """Черга одного WebSocket-з’єднання, прив’язана до його event loop."""
+
+    def __init__(self, topic, loop, maxsize=100):
+        self.topic = topic
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, payload):
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Повільний клієнт — пропускаємо подію, він отримає актуальний стан згодом
+            pass
+
+
+class BaseBroker:
+    """Інтерфейс брокера подій чату. Реалізацію обирає налаштування SUPPORT_CHAT_BROKER."""
+
+    def subscribe(self, topic):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def publish(self, topic, payload):
+        raise NotImplementedError
+
+    def has_subscribers(self, topic):
+        return True
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Брокер у межах одного процесу: publish можна викликати з будь-якого потоку
+    (наприклад, із синхронного view), доставка відбувається в loop підписника.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic):
+        subscription = Subscription(topic, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def publish(self, topic, payload):
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, payload)
+            except RuntimeError:
+                # Loop вже закрито — з’єднання зникло без unsubscribe
+                self.unsubscribe(subscription)
+
+    def has_subscribers(self, topic):
+        with self._lock:
+            return bool(self._subscribers.get(topic))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'SUPPORT_CHAT_BROKER', 'main.realtime.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def serialize_message(msg):
+    return {
+        'id': msg.id,
+        'user_id': msg.user_id,
+        'sender_id': msg.sender_id,
+        'message': msg.message,
+        'is_admin': msg.is_admin,
+        'created_at': msg.created_at.isoformat(),
+        'created_at_display': date_format(timezone.localtime(msg.created_at), 'd.m.Y H:i'),
+    }
+
+
+def publish_message(msg):
+    """Розсилає нове повідомлення учасникам розмови після коміту транзакції."""
+    payload = {'type': 'message', 'message': serialize_message(msg)}
+    topic = conversation_topic(msg.user_id)
+    transaction.on_commit(lambda: get_broker().publish(topic, payload))
+
+
+def publish_unread_count():
+    """Оновлює лічильник у відкритих вкладках персоналу (лише якщо вони є)."""
+    def send():
+        broker = get_broker()
+        if broker.has_subscribers(UNREAD_TOPIC):
+            broker.publish(UNREAD_TOPIC, {'type': 'unread', 'count': unread_count()})
+    transaction.on_commit(send)
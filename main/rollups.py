@@ -0,0 +1,261 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .db import serialized_write
+from .models import (
+    DailyServiceStat, DailyStat, OrderStatusStat, RollupWatermark, ServiceOrder, ServiceOrderHistory, SupportChat,
+)
+
+DASHBOARD_DAYS = 30
+# Скільки останніх повідомлень розмови переглядати, шукаючи питання без відповіді
+PENDING_LOOKBACK = 50
+# Скільки id кожного джерела обробляти в одній транзакції
+REFRESH_BATCH = 5000
+
+# Джерело -> (модель, поле часу створення)
+SOURCES = {
+    'orders': (ServiceOrder, 'created_at'),
+    'order_history': (ServiceOrderHistory, 'changed_at'),
+    'users': (User, 'date_joined'),
+    'chat': (SupportChat, 'created_at'),
+}
+
+
+def _upper_bound(model, date_field, now):
+    # Рядки, молодші за ROLLUP_SETTLE_SECONDS, враховуються наступного разу: на PostgreSQL
+    # паралельні транзакції можуть закомітити id не по порядку, і позначка їх би «перестрибнула»
+    settled = now - timedelta(seconds=getattr(settings, 'ROLLUP_SETTLE_SECONDS', 5))
+    return model._default_manager.filter(**{f'{date_field}__lt': settled}).aggregate(m=Max('id'))['m'] or 0
+
+
+def _apply_deltas(model, key_fields, deltas):
+    """
+    Додає прирости до рядків зведення: ``deltas`` — {ключ: {поле: приріст}}, де ключ —
+    кортеж значень key_fields. Наявні рядки оновлюються bulk_update, нові — bulk_create.
+    """
+    if not deltas:
+        return
+    existing = model.objects.filter(**{f'{key_fields[0]}__in': {key[0] for key in deltas}})
+    current = {tuple(getattr(obj, field) for field in key_fields): obj for obj in existing}
+    changed, created = [], []
+    for key, delta in deltas.items():
+        obj = current.get(key)
+        if obj is None:
+            obj = model(**dict(zip(key_fields, key)))
+            created.append(obj)
+        else:
+            changed.append(obj)
+        for field, value in delta.items():
+            setattr(obj, field, getattr(obj, field) + value)
+    value_fields = sorted({field for delta in deltas.values() for field in delta})
+    model.objects.bulk_update(changed, value_fields, batch_size=500)
+    model.objects.bulk_create(created, batch_size=500)
+
+
+def _order_deltas(lo, hi):
+    orders = (
+        ServiceOrder.objects.filter(id__gt=lo, id__lte=hi)
+        .annotate(day=TruncDate('created_at')).values_list('day', 'service_id').annotate(n=Count('id')).order_by()
+    )
+    return {(day, service_id): {'orders': n} for day, service_id, n in orders}
+
+
+def _status_deltas(order_lo, order_hi, history_lo, history_hi):
+    deltas = Counter()
+    # Переходи замовлень, які вже враховані в зведенні
+    transitions = (
+        ServiceOrderHistory.objects.filter(id__gt=history_lo, id__lte=history_hi, order_id__lte=order_lo)
+        .values_list('from_status', 'to_status').annotate(n=Count('id')).order_by()
+    )
+    for from_status, to_status, n in transitions:
+        deltas[from_status] -= n
+        deltas[to_status] += n
+
+    # Нові замовлення — у статусі на момент history_hi: пізніші переходи врахує наступне оновлення
+    new_orders = ServiceOrder.objects.filter(id__gt=order_lo, id__lte=order_hi)
+    for status, n in new_orders.values_list('status').annotate(n=Count('id')).order_by():
+        deltas[status] += n
+    later = {}
+    for order_id, from_status in (
+        ServiceOrderHistory.objects.filter(id__gt=history_hi, order_id__gt=order_lo, order_id__lte=order_hi)
+        .order_by('id').values_list('order_id', 'from_status')
+    ):
+        later.setdefault(order_id, from_status)
+    if later:
+        for order_id, status in new_orders.filter(id__in=list(later)).values_list('id', 'status'):
+            deltas[status] -= 1
+            deltas[later[order_id]] += 1
+    return {(status,): {'orders': n} for status, n in deltas.items() if n}
+
+
+def _signup_deltas(lo, hi):
+    users = (
+        User.objects.filter(id__gt=lo, id__lte=hi)
+        .annotate(day=TruncDate('date_joined')).values_list('day').annotate(n=Count('id')).order_by()
+    )
+    return {(day,): {'new_users': n} for day, n in users}
+
+
+def _pending_since(user_id, last_id):
+    """Час першого питання клієнта, на яке ще немає відповіді (серед повідомлень до last_id)."""
+    since = None
+    recent = (
+        SupportChat.objects.filter(user_id=user_id, id__lte=last_id)
+        .order_by('-created_at', '-id').values_list('created_at', 'is_admin')[:PENDING_LOOKBACK]
+    )
+    for created_at, is_admin in recent:
+        if is_admin:
+            break
+        since = created_at
+    return since
+
+
+def _support_deltas(lo, hi):
+    """
+    Час відповіді — від першого повідомлення клієнта після попередньої відповіді
+    адміністратора до наступної відповіді; зараховується на день відповіді.
+    """
+    messages = SupportChat.objects.filter(id__gt=lo, id__lte=hi)
+    pending = {}
+    if lo:
+        for user_id in messages.values_list('user_id', flat=True).distinct().order_by():
+            since = _pending_since(user_id, lo)
+            if since is not None:
+                pending[user_id] = since
+
+    deltas = defaultdict(lambda: {'responses': 0, 'response_seconds': 0.0})
+    stream = messages.order_by('user_id', 'created_at', 'id').values_list('user_id', 'created_at', 'is_admin')
+    for user_id, created_at, is_admin in stream.iterator(chunk_size=2000):
+        if not is_admin:
+            pending.setdefault(user_id, created_at)
+            continue
+        since = pending.pop(user_id, None)
+        if since is not None:
+            delta = deltas[(timezone.localdate(created_at),)]
+            delta['responses'] += 1
+            delta['response_seconds'] += (created_at - since).total_seconds()
+    return dict(deltas)
+
+
+def _lock_watermarks():
+    """
+    Позначки джерел, заблоковані до кінця транзакції: паралельні запуски (cron і --loop)
+    чекають один на одного, а не додають ті самі прирости двічі.
+    """
+    RollupWatermark.objects.bulk_create([RollupWatermark(source=source) for source in SOURCES], ignore_conflicts=True)
+    return {mark.source: mark for mark in RollupWatermark.objects.select_for_update().filter(source__in=SOURCES)}
+
+
+def _reset_rollups():
+    with serialized_write():
+        marks = _lock_watermarks()
+        for model in (DailyServiceStat, DailyStat, OrderStatusStat):
+            model.objects.all().delete()
+        for mark in marks.values():
+            mark.last_id = 0
+            mark.save(update_fields=['last_id', 'updated_at'])
+
+
+def _refresh_step(upper, batch_size):
+    """Один пакет: не більше batch_size id кожного джерела в окремій короткій транзакції."""
+    with serialized_write():
+        marks = _lock_watermarks()
+        bounds = {}
+        for source, mark in marks.items():
+            lo = mark.last_id
+            bounds[source] = (lo, max(lo, min(upper[source], lo + batch_size)))
+
+        daily = _signup_deltas(*bounds['users'])
+        for key, delta in _support_deltas(*bounds['chat']).items():
+            daily.setdefault(key, {}).update(delta)
+        _apply_deltas(DailyServiceStat, ('day', 'service_id'), _order_deltas(*bounds['orders']))
+        _apply_deltas(OrderStatusStat, ('status',), _status_deltas(*bounds['orders'], *bounds['order_history']))
+        _apply_deltas(DailyStat, ('day',), daily)
+
+        for source, mark in marks.items():
+            mark.last_id = bounds[source][1]
+            mark.save(update_fields=['last_id', 'updated_at'])
+    return bounds
+
+
+def refresh_rollups(full=False, batch_size=REFRESH_BATCH):
+    """
+    🔹 Оновлює зведення панелі лише за рядками, що з'явилися після попереднього
+    оновлення (позначки RollupWatermark по id), пакетами по batch_size id — запис у
+    базу не блокується на весь час оновлення. full=True спершу очищає зведення, а тоді
+    наздоганяє тим самим шляхом — потрібно після видалення замовлень чи користувачів,
+    які інкрементне оновлення не помічає; поки перебудова йде, панель показує неповні дані.
+    Повертає кількість нових рядків за джерелами.
+    """
+    now = timezone.now()
+    if full:
+        _reset_rollups()
+    upper = {source: _upper_bound(model, date_field, now) for source, (model, date_field) in SOURCES.items()}
+    processed = dict.fromkeys(SOURCES, 0)
+    while True:
+        bounds = _refresh_step(upper, batch_size)
+        for source, (lo, hi) in bounds.items():
+            processed[source] += hi - lo
+        if all(hi >= upper[source] for source, (_, hi) in bounds.items()):
+            return processed
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "—"
+    minutes = round(seconds / 60)
+    if minutes < 1:
+        return f"{round(seconds)} с"
+    if minutes < 60:
+        return f"{minutes} хв"
+    return f"{minutes // 60} год {minutes % 60} хв"
+
+
+def dashboard_data(days=DASHBOARD_DAYS):
+    """Дані панелі лише зі зведених таблиць — без GROUP BY по замовленнях і чату."""
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    daily = {stat.day: stat for stat in DailyStat.objects.filter(day__gte=since)}
+    orders_by_day = dict(
+        DailyServiceStat.objects.filter(day__gte=since).values_list('day').annotate(n=Sum('orders')).order_by()
+    )
+    rows = []
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        stat = daily.get(day) or DailyStat(day=day)
+        rows.append({
+            'day': day,
+            'orders': orders_by_day.get(day, 0),
+            'new_users': stat.new_users,
+            'responses': stat.responses,
+            'avg_response': format_duration(stat.avg_response_seconds),
+        })
+
+    responses = sum(stat.responses for stat in daily.values())
+    response_seconds = sum(stat.response_seconds for stat in daily.values())
+    status_counts = dict(OrderStatusStat.objects.values_list('status', 'orders'))
+    return {
+        'days': days,
+        'rows': rows,
+        'totals': {
+            'orders': sum(orders_by_day.values()),
+            'new_users': sum(stat.new_users for stat in daily.values()),
+            'responses': responses,
+            'avg_response': format_duration(response_seconds / responses if responses else None),
+        },
+        'services': (
+            DailyServiceStat.objects.filter(day__gte=since).values('service__title')
+            .annotate(orders=Sum('orders')).order_by('-orders')[:20]
+        ),
+        'statuses': [
+            (label, ServiceOrder.STATUS_BADGES[code], status_counts.get(code, 0))
+            for code, label in ServiceOrder.STATUS_CHOICES
+        ],
+        'updated_at': RollupWatermark.objects.aggregate(m=Max('updated_at'))['m'],
+    }
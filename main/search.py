@@ -0,0 +1,228 @@
+import re
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'main_search_index'
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+# Маркери підсвічування, яких не буває у звичайному тексті
+_MARK_OPEN, _MARK_CLOSE = '\x02', '\x03'
+
+
+def _indexed_models():
+    from .models import News, Service
+    # Порядок важливий: індекс моделі входить у rowid запису FTS
+    return (
+        ('service', Service, 'description'),
+        ('news', News, 'content'),
+    )
+
+
+class SearchHit:
+    def __init__(self, kind, object_id, title_html, snippet_html, obj=None):
+        self.kind = kind
+        self.object_id = object_id
+        self.title_html = title_html
+        self.snippet_html = snippet_html
+        self.object = obj
+
+
+class SearchResults:
+    """Лінива послідовність результатів для django.core.paginator.Paginator."""
+
+    def __init__(self, backend, query):
+        self.backend = backend
+        self.query = query
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count(self.query)
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start = item.start or 0
+        stop = item.stop if item.stop is not None else self.count()
+        hits = self.backend.search(self.query, offset=start, limit=max(stop - start, 0))
+        _attach_objects(hits)
+        return hits
+
+
+def _attach_objects(hits):
+    # По одному запиту на тип об’єкта для всієї сторінки результатів
+    for kind, model, _ in _indexed_models():
+        ids = [hit.object_id for hit in hits if hit.kind == kind]
+        if ids:
+            objects = model.objects.only(*model.LIST_FIELDS).in_bulk(ids)
+            for hit in hits:
+                if hit.kind == kind:
+                    hit.object = objects.get(hit.object_id)
+    hits[:] = [hit for hit in hits if hit.object is not None]
+
+
+def _highlight(text):
+    return mark_safe(escape(text).replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>'))
+
+
+class BaseSearchBackend:
+    """Інтерфейс пошукового бекенду. Реалізацію обирає налаштування SEARCH_BACKEND."""
+
+    def index(self, obj):
+        raise NotImplementedError
+
+    def remove(self, obj):
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=1000):
+        raise NotImplementedError
+
+    def count(self, query):
+        raise NotImplementedError
+
+    def search(self, query, offset=0, limit=20):
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Запасний бекенд без індексу (icontains) для баз даних без FTS5."""
+
+    def index(self, obj):
+        pass
+
+    def remove(self, obj):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        return 0
+
+    def _querysets(self, query):
+        for kind, model, body in _indexed_models():
+            condition = Q(title__icontains=query) | Q(**{f'{body}__icontains': query})
+            yield kind, body, model.objects.filter(condition).only(*model.LIST_FIELDS).order_by('-pk')
+
+    def count(self, query):
+        return sum(qs.count() for _, _, qs in self._querysets(query))
+
+    def search(self, query, offset=0, limit=20):
+        hits = []
+        for kind, body, qs in self._querysets(query):
+            for obj in qs[:offset + limit]:
+                hits.append(SearchHit(kind, obj.pk, escape(obj.title), escape(obj.excerpt), obj))
+        return hits[offset:offset + limit]
+
+
+class SqliteFTS5Backend(BaseSearchBackend):
+    """
+    Повнотекстовий індекс на віртуальній таблиці SQLite FTS5. rowid запису
+    кодує тип і id об’єкта, тож оновлення й видалення йдуть за первинним ключем.
+    """
+    title_weight = 10.0
+    body_weight = 1.0
+    snippet_tokens = 24
+
+    def _rowid(self, obj):
+        for position, (kind, model, _) in enumerate(_indexed_models()):
+            if isinstance(obj, model):
+                return obj.pk * len(_indexed_models()) + position
+        raise TypeError(f"{type(obj).__name__} не індексується пошуком")
+
+    def _body_field(self, obj):
+        for _, model, body in _indexed_models():
+            if isinstance(obj, model):
+                return body
+
+    def index(self, obj):
+        with connection.cursor() as cursor:
+            rowid = self._rowid(obj)
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [rowid])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+                [rowid, obj.title, getattr(obj, self._body_field(obj))],
+            )
+
+    def remove(self, obj):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [self._rowid(obj)])
+
+    def rebuild(self, batch_size=1000):
+        models = _indexed_models()
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            for position, (_, model, body) in enumerate(models):
+                rows = model.objects.order_by('pk').values_list('pk', 'title', body)
+                batch = []
+                for pk, title, text in rows.iterator(chunk_size=batch_size):
+                    batch.append((pk * len(models) + position, title, text))
+                    if len(batch) >= batch_size:
+                        cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', batch)
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', batch)
+                    total += len(batch)
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        return total
+
+    @staticmethod
+    def match_expression(query):
+        """Кожне слово — префіксний пошук; лапки не дають користувачу зламати синтаксис FTS."""
+        tokens = _TOKEN.findall(query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def count(self, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression])
+            return cursor.fetchone()[0]
+
+    def search(self, query, offset=0, limit=20):
+        expression = self.match_expression(query)
+        if not expression or limit <= 0:
+            return []
+        sql = (
+            f'SELECT rowid, highlight({FTS_TABLE}, 0, %s, %s), '
+            f'snippet({FTS_TABLE}, 1, %s, %s, %s, %s) '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'ORDER BY bm25({FTS_TABLE}, %s, %s), rowid DESC LIMIT %s OFFSET %s'
+        )
+        params = [
+            _MARK_OPEN, _MARK_CLOSE,
+            _MARK_OPEN, _MARK_CLOSE, '…', self.snippet_tokens,
+            expression, self.title_weight, self.body_weight, limit, offset,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        models = _indexed_models()
+        return [
+            SearchHit(models[rowid % len(models)][0], rowid // len(models), _highlight(title), _highlight(snippet))
+            for rowid, title, snippet in rows
+        ]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'SEARCH_BACKEND', 'main.search.SqliteFTS5Backend')
+                _backend = import_string(path)()
+    return _backend
@@ -0,0 +1,109 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from easy_thumbnails.signals import saved_file
+
+from .caching import bump_content_version
+from .counters import adjust_unread_count
+from .models import Contact, News, Order, Service, SupportChat, SupportConversation
+from .realtime import publish_message, publish_unread_count
+from .search import get_search_backend
+from .storage import content_addressed_fields
+from .tasks import enqueue_image_job
+
+
+@receiver(post_save, sender=SupportChat)
+def update_conversation_on_message(sender, instance, created, **kwargs):
+    # 🔹 Кожне нове повідомлення одразу оновлює підсумок розмови
+    if created:
+        SupportConversation.register_message(instance)
+        if not instance.is_read:
+            adjust_unread_count(1)
+        publish_message(instance)
+        publish_unread_count()
+
+
+@receiver(post_delete, sender=SupportChat)
+def rebuild_conversation_on_delete(sender, instance, **kwargs):
+    SupportConversation.rebuild_for(instance.user_id)
+    if not instance.is_read:
+        adjust_unread_count(-1)
+    publish_unread_count()
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=Contact)
+def invalidate_public_pages(sender, **kwargs):
+    # Нова версія контенту робить застарілими всі закешовані публічні сторінки
+    bump_content_version()
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=News)
+def index_searchable(sender, instance, **kwargs):
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=News)
+def unindex_searchable(sender, instance, **kwargs):
+    get_search_backend().remove(instance)
+
+
+# 🔹 Зменшені копії та WebP створює фоновий воркер (run_image_worker), а не запит.
+# saved_file надсилає easy-thumbnails для кожного щойно збереженого файлу.
+@receiver(saved_file)
+def generate_image_variants(sender, fieldfile, **kwargs):
+    if sender in (Service, News, Order):
+        enqueue_image_job(fieldfile.instance, fieldfile.field.name)
+
+
+# 🔹 Лічильники посилань контентно-адресованого сховища (main/storage.py):
+# заміна або видалення фото знімає посилання, останнє — видаляє файл.
+def _media_fields(model):
+    return [field for owner, field in content_addressed_fields() if owner is model]
+
+
+def _release_media(field, name):
+    # Старі файли поза cas/ (img/…) не мають лічильника і можуть бути спільними — не чіпаємо
+    if field.storage.is_content_addressed(name):
+        field.storage.delete(name)
+
+
+@receiver(pre_save, sender=Service)
+@receiver(pre_save, sender=News)
+@receiver(pre_save, sender=Order)
+def remember_replaced_media(sender, instance, raw=False, **kwargs):
+    fields = _media_fields(sender)
+    instance._replaced_media = []
+    if raw or not fields or instance._state.adding:
+        return
+    old = sender._base_manager.filter(pk=instance.pk).values(*(field.attname for field in fields)).first()
+    if old is None:
+        return
+    for field in fields:
+        old_name = old[field.attname]
+        if old_name and old_name != getattr(instance, field.attname).name:
+            instance._replaced_media.append((field, old_name))
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=Order)
+def release_replaced_media(sender, instance, **kwargs):
+    for field, old_name in getattr(instance, '_replaced_media', ()):
+        _release_media(field, old_name)
+    instance._replaced_media = []
+
+
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=News)
+@receiver(post_delete, sender=Order)
+def release_deleted_media(sender, instance, **kwargs):
+    for field in _media_fields(sender):
+        name = getattr(instance, field.attname).name
+        if name:
+            _release_media(field, name)
@@ -0,0 +1,143 @@
+import gzip
+import json
+import mimetypes
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.http import http_date, quote_etag
+
+try:
+    import brotli
+except ImportError:  # brotli необов'язковий (requirements-server.txt)
+    brotli = None
+
+# Текстові формати, які варто стискати; зображення вже стиснуті
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+# Варіанти в порядку переваги: (Content-Encoding, суфікс файлу)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+BOOTSTRAP_CDN = 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/'
+# Сторонні файли, що зберігаються в static/vendor/ (`manage.py vendor_static_assets`):
+# ключ -> (шлях у static, адреса CDN, SRI-хеш або None для source map)
+VENDOR_ASSETS = {
+    'bootstrap.css': (
+        'vendor/bootstrap/bootstrap.min.css', BOOTSTRAP_CDN + 'css/bootstrap.min.css',
+        'sha384-T3c6CoIi6uLrA9TneNEoa7RxnatzjcDSCmG1MXxSR1GAsXEV/Dwwykc2MPK8M2HN',
+    ),
+    'bootstrap.css.map': (
+        'vendor/bootstrap/bootstrap.min.css.map', BOOTSTRAP_CDN + 'css/bootstrap.min.css.map', None,
+    ),
+    'bootstrap.js': (
+        'vendor/bootstrap/bootstrap.bundle.min.js', BOOTSTRAP_CDN + 'js/bootstrap.bundle.min.js',
+        'sha384-C6RzsynM9kWDrMNeT87bh95OGNyZPhcTNXj1NW7RuBCsyN/o0jlpcV8Qyq46cDfL',
+    ),
+    'bootstrap.js.map': (
+        'vendor/bootstrap/bootstrap.bundle.min.js.map', BOOTSTRAP_CDN + 'js/bootstrap.bundle.min.js.map', None,
+    ),
+}
+
+
+def compress_file(path):
+    """Пише поруч із файлом .gz (і .br, якщо встановлено brotli), якщо це зменшує розмір."""
+    data = Path(path).read_bytes()
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data) * 0.95:
+            Path(f'{path}{suffix}').write_bytes(compressed)
+            written.append(suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    🔹 collectstatic: імена з хешем вмісту (staticfiles.json) і заздалегідь
+    стиснуті gzip/brotli-варіанти текстових файлів для StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                compress_file(self.path(name))
+
+
+class StaticFile:
+    __slots__ = ('path', 'size', 'content_type', 'etag', 'last_modified', 'cache_control', 'variants')
+
+    def __init__(self, path, cache_control):
+        stat = path.stat()
+        self.path = path
+        self.size = stat.st_size
+        self.content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'application/json'):
+            self.content_type += '; charset=utf-8'
+        self.etag = quote_etag(f'{int(stat.st_mtime)}-{stat.st_size:x}')
+        self.last_modified = http_date(stat.st_mtime)
+        self.cache_control = cache_control
+        self.variants = {}
+        for encoding, suffix in ENCODINGS:
+            compressed = path.with_name(path.name + suffix)
+            if compressed.exists():
+                self.variants[encoding] = (compressed, compressed.stat().st_size)
+
+
+class StaticFilesIndex:
+    """
+    Індекс STATIC_ROOT, побудований один раз при старті процесу: пошук файлу —
+    це звернення до словника, а не до файлової системи. Файли з хешем у назві
+    (значення staticfiles.json) віддаються з immutable-кешуванням на рік.
+    Невеликі файли тримаються в пам'яті (STATIC_MEMORY_CACHE_BYTES на процес).
+    """
+
+    def __init__(self, root, prefix):
+        self.root = Path(root)
+        self.prefix = prefix
+        self.files = {}
+        self._memory = {}
+        self._memory_left = getattr(settings, 'STATIC_MEMORY_CACHE_BYTES', 16 * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _hashed_names(self):
+        try:
+            manifest = json.loads((self.root / ManifestStaticFilesStorage.manifest_name).read_text())
+        except (OSError, ValueError):
+            return set()
+        return set(manifest.get('paths', {}).values())
+
+    def _scan(self):
+        hashed = self._hashed_names()
+        max_age = getattr(settings, 'STATIC_MAX_AGE', 60)
+        skip = tuple(suffix for _, suffix in ENCODINGS)
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(skip):
+                    continue
+                path = Path(dirpath) / filename
+                name = path.relative_to(self.root).as_posix()
+                cache_control = IMMUTABLE_CACHE_CONTROL if name in hashed else f'public, max-age={max_age}'
+                self.files[self.prefix + name] = StaticFile(path, cache_control)
+
+    def lookup(self, url_path):
+        return self.files.get(url_path)
+
+    def read(self, path, size):
+        """Вміст файлу; невеликі файли кешуються в пам'яті процесу."""
+        content = self._memory.get(path)
+        if content is None:
+            content = path.read_bytes()
+            with self._lock:
+                if size <= self._memory_left and path not in self._memory:
+                    self._memory[path] = content
+                    self._memory_left -= size
+        return content
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from pathlib import PurePosixPath
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction
+
+CAS_PREFIX = 'cas'
+
+
+def file_digest(content):
+    """sha256 і розмір файлу, прочитаного частинами."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    🔹 Сховище завантажень, де ім'я файлу — sha256 вмісту:
+    cas/ab/cd/abcd…ef.jpg. Те саме фото, завантажене для послуги, новини чи
+    замовлення, лежить на диску один раз; посилання рахує MediaBlob, а delete()
+    прибирає файл і його зменшені копії лише тоді, коли на нього більше ніхто не посилається.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Ім'я визначає вміст, тож суфікси проти колізій не потрібні
+        return name
+
+    def content_name(self, digest, original_name):
+        extension = PurePosixPath(original_name).suffix.lower()
+        return f'{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def is_content_addressed(self, name):
+        return bool(name) and name.startswith(CAS_PREFIX + '/')
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        digest, size = file_digest(content)
+        name = self.content_name(digest, name)
+        # Спершу посилання, потім файл: паралельне видалення побачить живий MediaBlob
+        MediaBlob.acquire(name, size)
+        full_path = self.path(name)
+        if not os.path.exists(full_path):
+            directory = os.path.dirname(full_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    for chunk in content.chunks():
+                        tmp.write(chunk)
+                # link не перезаписує: якщо той самий вміст уже записав інший запит — і добре
+                os.link(tmp_path, full_path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(tmp_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def delete(self, name):
+        if not self.is_content_addressed(name):
+            return super().delete(name)
+
+        from .models import MediaBlob
+        from .thumbnails import delete_variants
+
+        if MediaBlob.release(name):
+            def remove():
+                # Файл міг знову знадобитися новому завантаженню до коміту
+                if not MediaBlob.objects.filter(name=name).exists():
+                    super(ContentAddressedStorage, self).delete(name)
+                    delete_variants(self, name)
+            transaction.on_commit(remove)
+
+
+def content_addressed_fields():
+    """Пари (модель, поле) з файлами в ContentAddressedStorage."""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def count_references():
+    """Фактична кількість посилань на кожен файл сховища за даними моделей."""
+    references = Counter()
+    for model, field in content_addressed_fields():
+        rows = (
+            model._default_manager.filter(**{f'{field.name}__startswith': CAS_PREFIX + '/'})
+            .values(field.name).annotate(n=models.Count('pk')).order_by()
+        )
+        for row in rows:
+            references[row[field.name]] += row['n']
+    return references
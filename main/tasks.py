@@ -0,0 +1,96 @@
+import traceback
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ImageJob
+from .thumbnails import generate_variants
+
+MAX_ATTEMPTS = getattr(settings, 'IMAGE_JOB_MAX_ATTEMPTS', 5)
+RETRY_BASE_SECONDS = getattr(settings, 'IMAGE_JOB_RETRY_SECONDS', 30)
+
+
+def enqueue_image_job(instance, field_name):
+    """Ставить обробку фото в чергу після коміту транзакції, не блокуючи запит."""
+    def create():
+        ImageJob.objects.create(
+            model_label=instance._meta.label,
+            object_id=instance.pk,
+            field_name=field_name,
+        )
+    transaction.on_commit(create)
+
+
+def requeue_stale_jobs(older_than):
+    """Повертає в чергу завдання, які «зависли» після падіння воркера."""
+    cutoff = timezone.now() - older_than
+    return ImageJob.objects.filter(status=ImageJob.RUNNING, updated_at__lt=cutoff).update(
+        status=ImageJob.PENDING, updated_at=timezone.now(),
+    )
+
+
+def claim_jobs(limit):
+    """Атомарно забирає до ``limit`` завдань, час яких настав."""
+    with transaction.atomic():
+        ids = list(
+            ImageJob.objects
+            .filter(status=ImageJob.PENDING, run_after__lte=timezone.now())
+            .order_by('run_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        ImageJob.objects.filter(id__in=ids, status=ImageJob.PENDING).update(
+            status=ImageJob.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now(),
+        )
+        return list(ImageJob.objects.filter(id__in=ids, status=ImageJob.RUNNING).values_list(
+            'id', 'model_label', 'object_id', 'field_name',
+        ))
+
+
+def init_worker_process():
+    # Пул запускається через fork (run_image_worker), тож Django уже налаштований;
+    # дочірній процес лише не повинен користуватися з’єднаннями батьківського
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+
+
+def run_job(job_id, model_label, object_id, field_name):
+    """
+    Виконується в процесі пулу. Повертає (job_id, None) при успіху або
+    (job_id, текст помилки). Статус завдання записує лише батьківський процес.
+    """
+    try:
+        model = apps.get_model(model_label)
+        obj = model.objects.filter(pk=object_id).only('pk', field_name).first()
+        fieldfile = getattr(obj, field_name, None) if obj is not None else None
+        if fieldfile:
+            generate_variants(fieldfile)
+        return job_id, None
+    except Exception:
+        return job_id, traceback.format_exc(limit=5)
+    finally:
+        connections.close_all()
+
+
+def record_result(job_id, error):
+    if error is None:
+        ImageJob.objects.filter(id=job_id).update(status=ImageJob.DONE, last_error='', updated_at=timezone.now())
+        return
+
+    job = ImageJob.objects.filter(id=job_id).only('attempts').first()
+    if job is None:
+        return
+    if job.attempts >= MAX_ATTEMPTS:
+        status, run_after = ImageJob.FAILED, timezone.now()
+    else:
+        # Експоненційна затримка між повторами: 30 с, 60 с, 120 с, ...
+        status = ImageJob.PENDING
+        run_after = timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+    ImageJob.objects.filter(id=job_id).update(
+        status=status, last_error=error, run_after=run_after, updated_at=timezone.now(),
+    )
@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from main.staticfiles import VENDOR_ASSETS
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def _is_vendored(path):
+    return finders.find(path) is not None
+
+
+@register.simple_tag
+def vendor_asset(key):
+    """
+    <link>/<script> для стороннього файлу (див. VENDOR_ASSETS). Локальна копія зі
+    static/vendor/ має пріоритет; поки її не завантажено, підключається CDN з SRI.
+    """
+    path, cdn_url, integrity = VENDOR_ASSETS[key]
+    if _is_vendored(path):
+        url, attrs = static(path), ''
+    else:
+        url, attrs = cdn_url, format_html(' integrity="{}" crossorigin="anonymous"', integrity)
+    if path.endswith('.css'):
+        return format_html('<link href="{}" rel="stylesheet"{}>', url, attrs)
+    return format_html('<script src="{}"{}></script>', url, attrs)
@@ -0,0 +1,28 @@
+from django import template
+from django.utils.html import format_html
+
+from main.thumbnails import variant_srcsets
+
+register = template.Library()
+
+DEFAULT_SIZES = '(min-width: 768px) 33vw, (min-width: 576px) 50vw, 100vw'
+
+
+@register.simple_tag
+def responsive_image(image, alt='', css_class='', style='', sizes=DEFAULT_SIZES):
+    """
+    <picture> з WebP та зменшеними варіантами зображення для карток.
+    Поки варіанти не згенеровано, віддає оригінальний файл.
+    """
+    if not image:
+        return ''
+    srcset, webp_srcset, fallback = variant_srcsets(image)
+    if not fallback:
+        return format_html('<img src="{}" alt="{}" class="{}" style="{}" loading="lazy">',
+                           image.url, alt, css_class, style)
+
+    webp_source = format_html('<source type="image/webp" srcset="{}" sizes="{}">', webp_srcset, sizes) if webp_srcset else ''
+    return format_html(
+        '<picture style="display: contents;">{}<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" style="{}" loading="lazy"></picture>',
+        webp_source, fallback, srcset, sizes, alt, css_class, style,
+    )
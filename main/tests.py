@@ -1,3 +1,1053 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.db.models import QuerySet
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    CHAT_PAGE_SIZE,
+    DailyServiceStat, DailyStat, ImageJob, MediaBlob, News, OrderStatusStat, Service, ServiceOrder, ServiceOrderHistory,
+    RollupWatermark, SupportChat, SupportConversation, UserProfile,
+)
+from .consumers import websocket_application
+from .counters import UNREAD_CACHE_KEY, unread_count
+from .management.commands.copy_sqlite_data import SOURCE_ALIAS
+from .pagination import keyset_paginate
+from .perf import collect_stats, reset_stats
+from .rollups import SOURCES, refresh_rollups
+from .search import FTS_TABLE, SqliteFTS5Backend, get_search_backend
+from .tasks import MAX_ATTEMPTS, claim_jobs, record_result, requeue_stale_jobs
+from .thumbnails import generate_variants, variant_srcsets
+
+# Таблиці, для яких повне сканування у «гарячих» view вважається регресією
+HOT_TABLES = ('main_supportchat', 'main_serviceorder', 'main_news', 'main_supportconversation')
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def full_scans(captured_queries):
+    """Повертає список (таблиця, sql) для запитів, які SQLite виконує повним скануванням."""
+    scans = []
+    with connection.cursor() as cursor:
+        for query in captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            for row in cursor.fetchall():
+                match = FULL_SCAN.match(row[-1])
+                if match and match.group(1) in HOT_TABLES:
+                    scans.append((match.group(1), sql))
+    return scans
+
+
+class MigrationAuditTests(TestCase):
+    def test_models_match_migrations(self):
+        call_command('makemigrations', 'main', check=True, dry_run=True, verbosity=0)
+
+
+class KeysetPaginationTests(TestCase):
+    """Курсор зберігає мікросекунди: рядки на межі сторінки не повторюються й не губляться."""
+
+    @classmethod
+    def setUpTestData(cls):
+        base = timezone.now().replace(microsecond=0)
+        # Час відрізняється менш ніж на мілісекунду, а далі ціла група з однаковим часом (як після bulk_create)
+        stamps = [base + timedelta(microseconds=100 * i) for i in range(5)] + [base + timedelta(seconds=1)] * 5
+        User.objects.bulk_create(User(username=f'user{i}', date_joined=stamp) for i, stamp in enumerate(stamps))
+
+    def walk(self, ordering, per_page):
+        seen, cursor = [], None
+        for _ in range(User.objects.count() + 1):
+            page = keyset_paginate(User.objects.all(), ordering, cursor, per_page)
+            seen += [user.username for user in page]
+            if not page.has_next:
+                return seen
+            cursor = page.next_cursor
+        self.fail(f'Пагінація {ordering} не дійшла до кінця: {seen}')
+
+    def test_each_row_exactly_once(self):
+        expected = list(User.objects.order_by('date_joined', 'id').values_list('username', flat=True))
+        for per_page in (1, 2, 3):
+            self.assertEqual(self.walk(('date_joined', 'id'), per_page), expected)
+            self.assertEqual(self.walk(('-date_joined', '-id'), per_page), expected[::-1])
+
+
+class PaginatedViewsTests(TestCase):
+    """Списки з keyset-пагінацією віддають кожен рядок рівно один раз до останньої сторінки."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        User.objects.bulk_create(User(username=f'client{i}') for i in range(60))
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        News.objects.bulk_create(News(title=f'Новина {i}', content='Текст') for i in range(30))
+        ServiceOrder.objects.bulk_create(
+            ServiceOrder(user=user, service=service) for user in User.objects.filter(username__startswith='client')
+        )
+        # Групи з однаковим часом і часом, що відрізняється менш ніж на мілісекунду
+        base = timezone.now().replace(microsecond=0)
+        for model, field in ((User, 'date_joined'), (News, 'date'), (ServiceOrder, 'created_at')):
+            for i, pk in enumerate(model.objects.order_by('pk').values_list('pk', flat=True)):
+                stamp = base + timedelta(seconds=i // 20, microseconds=100 * (i % 3))
+                model.objects.filter(pk=pk).update(**{field: stamp})
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def walk(self, url, **params):
+        seen = []
+        for _ in range(20):
+            page = self.client.get(url, params).context['page']
+            seen += [obj.pk for obj in page]
+            if not page.has_next:
+                return seen
+            params['after'] = page.next_cursor
+        self.fail(f'{url} не дійшов до останньої сторінки')
+
+    def test_news_list(self):
+        expected = list(News.objects.order_by('-date', '-id').values_list('pk', flat=True))
+        self.assertEqual(self.walk(reverse('news')), expected)
+
+    def test_admin_order_list(self):
+        expected = list(ServiceOrder.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(self.walk(reverse('admin_order_list')), expected)
+
+    def test_admin_user_list_sorts(self):
+        for sort, ordering in (('old', ('date_joined', 'id')), ('new', ('-date_joined', '-id')), ('username', ('username',))):
+            expected = list(User.objects.order_by(*ordering).values_list('pk', flat=True))
+            self.assertEqual(self.walk(reverse('admin_user_list'), sort=sort), expected)
+
+
+class QueryPlanTests(TestCase):
+    """EXPLAIN QUERY PLAN для view з найчастішими запитами: жодних повних сканувань."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        cls.client_user = User.objects.create_user('client', password='x')
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        News.objects.create(title='Новина', content='Текст')
+        ServiceOrder.objects.create(user=cls.client_user, service=service)
+        SupportChat.objects.create(user=cls.client_user, sender=cls.client_user, message='Привіт')
+
+    def setUp(self):
+        cache.clear()
+
+    def assertNoFullScans(self, user, url):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN доступний лише для SQLite')
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(full_scans(ctx.captured_queries), [])
+
+    def test_profile_view(self):
+        self.assertNoFullScans(self.client_user, reverse('profile'))
+
+    def test_profile_view_staff(self):
+        self.assertNoFullScans(self.staff, reverse('profile'))
+
+    def test_admin_chat_view(self):
+        self.assertNoFullScans(self.staff, reverse('admin_chat', args=[self.client_user.id]))
+
+    def test_admin_support_list(self):
+        self.assertNoFullScans(self.staff, reverse('admin_support_list'))
+
+    def test_admin_user_list(self):
+        self.assertNoFullScans(self.staff, reverse('admin_user_list') + '?sort=new&has_orders=1')
+
+    def test_admin_user_detail(self):
+        self.assertNoFullScans(self.staff, reverse('admin_user_detail', args=[self.client_user.id]))
+
+    def test_news_list(self):
+        self.assertNoFullScans(self.staff, reverse('news'))
+
+    def test_admin_order_list(self):
+        self.assertNoFullScans(self.staff, reverse('admin_order_list') + '?status=new')
+
+
+class CopySqliteDataTests(TransactionTestCase):
+    """copy_sqlite_data замінює дані цільової бази копією з файлу SQLite, зберігаючи id і дати."""
+
+    def test_copy_preserves_keys_timestamps_and_derived_data(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Джерелом слугує копія файлу тестової бази SQLite')
+        customer = User.objects.create_user('client', password='x')
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        order = ServiceOrder.objects.create(user=customer, service=service)
+        created_at = timezone.now() - timedelta(days=30)
+        ServiceOrder.objects.filter(pk=order.pk).update(created_at=created_at)
+        SupportChat.objects.create(user=customer, sender=customer, message='Привіт')
+
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'source.sqlite3')
+            connection.ensure_connection()
+            source = sqlite3.connect(path)
+            connection.connection.backup(source)
+            source.close()
+
+            # Те, чого немає в джерелі, після копіювання зникає
+            ServiceOrder.objects.all().delete()
+            User.objects.create_user('stray', password='x')
+            # Команда відкриває тимчасовий аліас джерела — тест має дозволити з'єднання з ним
+            with mock.patch.object(type(self), 'databases', {'default', SOURCE_ALIAS}):
+                call_command('copy_sqlite_data', path=path, interactive=False, stdout=StringIO())
+
+        self.assertFalse(User.objects.filter(username='stray').exists())
+        self.assertEqual(ServiceOrder.objects.get(pk=order.pk).created_at, created_at)
+        self.assertEqual(SupportConversation.objects.get(user=customer).unread_count, 1)
+        self.assertEqual(unread_count(), 1)
+        if isinstance(get_search_backend(), SqliteFTS5Backend):
+            self.assertEqual(get_search_backend().count('банер'), 1)
+
+
+class ConcurrentWriteTests(TransactionTestCase):
+    """Паралельні повідомлення чату й позначки прочитання не дають "database is locked"."""
+    writers = 8
+    messages_per_writer = 25
+
+    def test_concurrent_chat_posts_and_mark_read(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Перевірка стосується блокувань SQLite')
+        staff = User.objects.create_user('admin', password='x', is_staff=True)
+        customers = [User.objects.create_user(f'client{i}', password='x') for i in range(self.writers)]
+        errors = []
+        barrier = threading.Barrier(self.writers + 1)
+
+        def post_messages(user):
+            client = Client()
+            client.force_login(user)
+            url = reverse('chat_messages_api', args=[user.id])
+            barrier.wait()
+            try:
+                for i in range(self.messages_per_writer):
+                    response = client.post(url, {'message': f'повідомлення {i}'})
+                    if response.status_code != 201:
+                        errors.append(response.status_code)
+            except OperationalError as exc:
+                errors.append(str(exc))
+            finally:
+                connection.close()
+
+        def mark_read():
+            client = Client()
+            client.force_login(staff)
+            barrier.wait()
+            try:
+                for _ in range(self.messages_per_writer):
+                    for user in customers:
+                        client.get(reverse('admin_chat', args=[user.id]))
+            except OperationalError as exc:
+                errors.append(str(exc))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post_messages, args=(user,)) for user in customers]
+        threads.append(threading.Thread(target=mark_read))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(SupportChat.objects.count(), self.writers * self.messages_per_writer)
+        for user in customers:
+            unread = SupportChat.objects.filter(user=user, is_read=False).count()
+            self.assertEqual(SupportConversation.objects.get(user=user).unread_count, unread)
+
+
+class SearchTests(TestCase):
+    """Ранжування й посторінковий вивід /search/ на індексі FTS5."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = Service.objects.create(title='Банер вуличний', description='Друк на сітці')
+        for i in range(14):
+            News.objects.create(title=f'Новина {i}', content=f'Згадка про банери та вивіски №{i}')
+        News.objects.create(title='Календарі', content='Без збігів')
+
+    def setUp(self):
+        if not isinstance(get_search_backend(), SqliteFTS5Backend):
+            self.skipTest('Потрібен SqliteFTS5Backend')
+        cache.clear()
+
+    def search(self, query, page=1):
+        response = self.client.get(reverse('search'), {'q': query, 'page': page})
+        self.assertEqual(response.status_code, 200)
+        return response.context['page']
+
+    def test_title_match_ranks_first_and_prefixes_match(self):
+        page = self.search('банер')
+        self.assertEqual(page.paginator.count, 15)
+        first = page.object_list[0]
+        self.assertEqual((first.kind, first.object_id), ('service', self.service.id))
+        self.assertIn('<mark>', str(first.title_html))
+
+    def test_pages_cover_every_hit_once(self):
+        first = self.search('банер')
+        seen = []
+        for number in first.paginator.page_range:
+            seen += [(hit.kind, hit.object_id) for hit in self.search('банер', number).object_list]
+        self.assertEqual(len(seen), 15)
+        self.assertEqual(len(set(seen)), 15)
+
+    def test_index_follows_changes_and_syntax_is_escaped(self):
+        self.service.delete()
+        self.assertEqual(self.search('вуличний').paginator.count, 0)
+        self.assertEqual(self.search('"банер* (').paginator.count, 14)
+
+
+class ChatMessagesApiTests(TestCase):
+    """JSON API історії чату: порції за курсором, межі limit, доступ і нові повідомлення."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        cls.customer = User.objects.create_user('client', password='x')
+        cls.messages = [
+            SupportChat.objects.create(user=cls.customer, sender=cls.customer, message=f'Питання {i}')
+            for i in range(5)
+        ]
+
+    def get(self, **params):
+        response = self.client.get(reverse('chat_messages_api', args=[self.customer.id]), params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [message['id'] for message in data['messages']], data['has_more']
+
+    def test_windows_and_limit_bounds(self):
+        self.client.force_login(self.customer)
+        ids = [msg.id for msg in self.messages]
+        self.assertEqual(self.get(limit=2), (ids[3:], True))
+        self.assertEqual(self.get(limit=2, before=ids[3]), (ids[1:3], True))
+        self.assertEqual(self.get(limit=2, before=ids[1]), (ids[:1], False))
+        self.assertEqual(self.get(after=ids[2]), (ids[3:], None))
+        self.assertEqual(self.get(limit=-5), (ids[4:], True))
+        self.assertEqual(self.get(limit='abc'), (ids, False))
+        self.assertLessEqual(len(self.get(limit=10 ** 6)[0]), CHAT_PAGE_SIZE * 4)
+
+    def test_access_and_posting(self):
+        other = User.objects.create_user('other', password='x')
+        self.client.force_login(other)
+        response = self.client.get(reverse('chat_messages_api', args=[self.customer.id]))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.staff)
+        url = reverse('chat_messages_api', args=[self.customer.id])
+        self.assertEqual(self.client.post(url, {'message': '  '}).status_code, 400)
+        response = self.client.post(url, {'message': 'Відповідь'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.json()['message']['is_admin'])
+        missing = reverse('chat_messages_api', args=[other.id + 1000])
+        self.assertEqual(self.client.post(missing, {'message': 'Нікому'}).status_code, 404)
+
+
+class PublicPageCacheTests(TestCase):
+    """Кеш публічних сторінок для анонімів: 304 за ETag/Last-Modified і нова версія після змін."""
+
+    def setUp(self):
+        cache.clear()
+        Service.objects.create(title='Банер', description='Друк банерів')
+
+    def test_conditional_get_and_cached_body(self):
+        response = self.client.get(reverse('catalog'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Cookie', response['Vary'])
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('catalog'))
+            not_modified = self.client.get(reverse('catalog'), headers={'if-none-match': response['ETag']})
+            by_date = self.client.get(reverse('catalog'), headers={'if-modified-since': response['Last-Modified']})
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_content_change_invalidates_pages(self):
+        response = self.client.get(reverse('catalog'))
+        Service.objects.create(title='Вивіска', description='Світлові літери')
+        fresh = self.client.get(reverse('catalog'), headers={'if-none-match': response['ETag']})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], response['ETag'])
+        self.assertContains(fresh, 'Вивіска')
+
+    def test_logged_in_users_bypass_cache(self):
+        self.client.force_login(User.objects.create_user('client', password='x'))
+        response = self.client.get(reverse('catalog'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+class PerfStatsTests(TestCase):
+    """Знімки статистики завершених процесів прибираються, а не зливаються у звіт."""
+
+    def test_dead_process_snapshots_are_removed(self):
+        if os.name != 'posix':
+            self.skipTest('Перевірка процесів через os.kill лише на POSIX')
+        entry = {'samples': [{'total_ms': 1, 'sql_ms': 0, 'template_ms': 0, 'queries': 1}], 'requests': 1, 'n_plus_one': 0}
+        finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+        finished.wait()
+        with tempfile.TemporaryDirectory() as root, override_settings(PERF_STATS_DIR=root):
+            dead = os.path.join(root, f'{finished.pid}.json')
+            with open(dead, 'w') as fh:
+                json.dump({'dead_view': entry}, fh)
+            with open(os.path.join(root, f'{os.getppid()}.json'), 'w') as fh:
+                json.dump({'live_view': entry}, fh)
+
+            stats = collect_stats()
+            self.assertIn('live_view', stats)
+            self.assertNotIn('dead_view', stats)
+            self.assertFalse(os.path.exists(dead))
+
+            reset_stats()
+            self.assertEqual(os.listdir(root), [])
+
+
+class SeedDataTests(TestCase):
+    """seed_benchmark_data: кількості, похідні дані після bulk_create і відтворюваність."""
+
+    def seed(self, **options):
+        call_command('seed_benchmark_data', users=20, services=5, news=10, orders=40, messages=100,
+                     stdout=StringIO(), **options)
+        return list(User.objects.filter(username__startswith='bench_user_')
+                    .order_by('username').values_list('username', 'first_name', 'profile__phone'))
+
+    def test_seed_builds_derived_data_and_is_reproducible(self):
+        cache.clear()
+        users = self.seed()
+        self.assertEqual(len(users), 20)
+        self.assertEqual(Service.objects.count(), 5)
+        self.assertEqual(News.objects.count(), 10)
+        self.assertEqual(ServiceOrder.objects.count(), 40)
+        self.assertEqual(SupportChat.objects.count(), 100)
+        self.assertFalse(News.objects.filter(excerpt='').exists())
+
+        # Підсумки розмов, лічильник і пошуковий індекс перебудовані, хоча сигнали не спрацьовували
+        for conversation in SupportConversation.objects.all():
+            unread = SupportChat.objects.filter(user_id=conversation.user_id, is_read=False).count()
+            self.assertEqual(conversation.unread_count, unread)
+        self.assertEqual(unread_count(), SupportChat.objects.filter(is_read=False).count())
+        if isinstance(get_search_backend(), SqliteFTS5Backend):
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+                self.assertEqual(cursor.fetchone()[0], 15)
+
+        self.assertEqual(self.seed(clear=True), users)
+
+
+class UnreadCounterTests(TestCase):
+    """Кешований лічильник непрочитаних змінюється лише після коміту."""
+
+    def test_rolled_back_message_does_not_change_counter(self):
+        user = User.objects.create_user('client', password='x')
+        cache.set(UNREAD_CACHE_KEY, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                SupportChat.objects.create(user=user, sender=user, message='Відкотиться')
+                transaction.set_rollback(True)
+        self.assertEqual(unread_count(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            SupportChat.objects.create(user=user, sender=user, message='Привіт')
+        self.assertEqual(unread_count(), 1)
+
+    def test_opening_chat_marks_only_that_thread_read(self):
+        staff = User.objects.create_user('admin', password='x', is_staff=True)
+        first, second = (User.objects.create_user(name, password='x') for name in ('first', 'second'))
+        with self.captureOnCommitCallbacks(execute=True):
+            for user, count in ((first, 3), (second, 2)):
+                for i in range(count):
+                    SupportChat.objects.create(user=user, sender=user, message=f'Питання {i}')
+        self.assertEqual(unread_count(), 5)
+
+        self.client.force_login(staff)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.get(reverse('admin_chat', args=[first.id])).status_code, 200)
+        self.assertFalse(SupportChat.objects.filter(user=first, is_read=False).exists())
+        self.assertEqual(SupportChat.objects.filter(user=second, is_read=False).count(), 2)
+        self.assertEqual(SupportConversation.objects.get(user=first).unread_count, 0)
+        self.assertEqual(SupportConversation.objects.get(user=second).unread_count, 2)
+        self.assertEqual(unread_count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(SupportChat.mark_thread_read(second.id, batch_size=1), 2)
+            self.assertEqual(SupportChat.mark_thread_read(first.id), 0)
+        self.assertEqual(SupportConversation.objects.get(user=second).unread_count, 0)
+        self.assertEqual(unread_count(), 0)
+
+
+class AsyncViewTests(TestCase):
+    """Async-версії публічних сторінок і лічильника непрочитаних (під ASGI)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        client_user = User.objects.create_user('client', password='x')
+        Service.objects.create(title='Банер', description='Друк банерів')
+        News.objects.create(title='Новина', content='Текст')
+        SupportChat.objects.create(user=client_user, sender=client_user, message='Привіт')
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_public_pages_render_and_revalidate(self):
+        for name in ('home', 'catalog', 'news'):
+            response = await self.async_client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            cached = await self.async_client.get(reverse(name), headers={'if-none-match': response['ETag']})
+            self.assertEqual(cached.status_code, 304)
+        response = await self.async_client.get(reverse('search'), {'q': 'банер'})
+        self.assertContains(response, 'Банер')
+
+    def test_logged_in_pages_load_user_once(self):
+        self.client.force_login(self.staff)
+        for name in ('home', 'catalog', 'news', 'contacts'):
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+            user_queries = [query for query in ctx.captured_queries if 'FROM "auth_user"' in query['sql']]
+            self.assertEqual(len(user_queries), 1, name)
+
+    def test_home_fragments_skip_card_queries(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertContains(self.client.get(reverse('home')), 'Банер')
+        card_tables = ('"main_service"', '"main_news"')
+        self.assertFalse([query for query in ctx.captured_queries if any(table in query['sql'] for table in card_tables)])
+
+    async def test_unread_count_for_staff(self):
+        response = await self.async_client.get(reverse('get_unread_count'))
+        self.assertEqual(response.status_code, 302)
+        await self.async_client.aforce_login(self.staff)
+        response = await self.async_client.get(reverse('get_unread_count'))
+        self.assertEqual(response.json(), {'count': 1})
+
+
+class SupportSocketTests(TransactionTestCase):
+    """WebSocket чату підтримки: доступ, розсилка через InProcessBroker і лічильник для персоналу."""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        self.customer = User.objects.create_user('client', password='x')
+        self.other = User.objects.create_user('other', password='x')
+        self.cookies = {}
+        for user in (self.staff, self.customer):
+            client = Client()
+            client.force_login(user)
+            self.cookies[user.id] = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    async def connect(self, path, user=None, origin=None):
+        headers = [(b'host', b'testserver')]
+        if user is not None:
+            headers.append((b'cookie', self.cookies[user.id].encode()))
+        if origin is not None:
+            headers.append((b'origin', origin.encode()))
+        socket = ApplicationCommunicator(websocket_application, {'type': 'websocket', 'path': path, 'headers': headers})
+        await socket.send_input({'type': 'websocket.connect'})
+        return socket
+
+    async def accept(self, path, user):
+        socket = await self.connect(path, user, origin='http://testserver')
+        self.assertEqual(await socket.receive_output(1), {'type': 'websocket.accept'})
+        return socket
+
+    async def receive_json(self, socket):
+        return json.loads((await socket.receive_output(2))['text'])
+
+    async def disconnect(self, *sockets):
+        for socket in sockets:
+            await socket.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await socket.wait(1)
+
+    async def test_rejects_anonymous_foreign_origin_and_other_users(self):
+        conversation = f'/ws/support/{self.customer.id}/'
+        for path, user, origin in (
+            (conversation, None, None),
+            (conversation, self.customer, 'https://evil.example'),
+            (f'/ws/support/{self.other.id}/', self.customer, None),
+            ('/ws/support/unread/', self.customer, None),
+        ):
+            socket = await self.connect(path, user, origin)
+            self.assertEqual(await socket.receive_output(1), {'type': 'websocket.close', 'code': 4403})
+
+    async def test_missing_conversation_is_rejected_before_accept(self):
+        socket = await self.connect('/ws/support/999999/', self.staff)
+        self.assertEqual(await socket.receive_output(1), {'type': 'websocket.close', 'code': 4404})
+
+    async def test_message_fans_out_to_other_subscribers(self):
+        path = f'/ws/support/{self.customer.id}/'
+        customer_socket = await self.accept(path, self.customer)
+        staff_socket = await self.accept(path, self.staff)
+        await customer_socket.send_input({'type': 'websocket.receive', 'text': json.dumps({'message': 'Привіт'})})
+        for socket in (customer_socket, staff_socket):
+            payload = await self.receive_json(socket)
+            self.assertEqual(payload['type'], 'message')
+            self.assertEqual(payload['message']['message'], 'Привіт')
+            self.assertEqual(payload['message']['sender_id'], self.customer.id)
+        await self.disconnect(customer_socket, staff_socket)
+
+    async def test_staff_unread_feed(self):
+        socket = await self.accept('/ws/support/unread/', self.staff)
+        self.assertEqual(await self.receive_json(socket), {'type': 'unread', 'count': 0})
+        await sync_to_async(SupportChat.post)(self.customer.id, self.customer, 'Привіт', is_admin=False)
+        self.assertEqual(await self.receive_json(socket), {'type': 'unread', 'count': 1})
+        await self.disconnect(socket)
+
+
+class StaticPipelineTests(TestCase):
+    """collectstatic з хешованими іменами та gzip-варіантами, StaticFilesMiddleware."""
+
+    def test_hashed_assets_are_compressed_and_immutable(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root, STATIC_SERVE=True,
+            STORAGES={**settings.STORAGES, 'staticfiles': {
+                'BACKEND': 'main.staticfiles.CompressedManifestStaticFilesStorage',
+            }},
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            url = staticfiles_storage.url('js/support-chat.js')
+            self.assertRegex(url, r'support-chat\.[0-9a-f]{12}\.js$')
+
+            client = Client()
+            response = client.get(url, headers={'accept-encoding': 'gzip, deflate'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(response.content), staticfiles_storage.open('js/support-chat.js').read())
+
+            cached = client.get(url, headers={'if-none-match': response['ETag']})
+            self.assertEqual(cached.status_code, 304)
+
+            # Токени розбираються з q-вагами, а не пошуком підрядка
+            for header, encoding in (('gzip;q=0, deflate', None), ('x-gzip', None), ('*', 'gzip'),
+                                     ('*, gzip;q=0', None), ('deflate, GZIP; q=0.5', 'gzip')):
+                response = client.get(url, headers={'accept-encoding': header})
+                self.assertEqual(response.get('Content-Encoding'), encoding, header)
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Однакові завантаження зберігаються один раз і видаляються з останнім посиланням."""
+
+    def test_identical_uploads_share_one_file(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(MEDIA_ROOT=root):
+            service = Service.objects.create(title='Банер', description='Друк',
+                                             image=ContentFile(b'same bytes', name='a.jpg'))
+            news = News.objects.create(title='Новина', content='Текст',
+                                       image=ContentFile(b'same bytes', name='b.JPG'))
+            self.assertEqual(service.image.name, news.image.name)
+            self.assertRegex(service.image.name, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+            self.assertEqual(MediaBlob.objects.get(name=news.image.name).refcount, 2)
+
+            path = service.image.path
+            with self.captureOnCommitCallbacks(execute=True):
+                service.delete()
+            self.assertEqual(MediaBlob.objects.get(name=news.image.name).refcount, 1)
+            with self.captureOnCommitCallbacks(execute=True):
+                news.image = ContentFile(b'other bytes', name='c.jpg')
+                news.save()
+            self.assertEqual(MediaBlob.objects.count(), 1)
+            self.assertFalse(os.path.exists(path))
+
+    def test_legacy_files_outside_cas_are_kept(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(MEDIA_ROOT=root):
+            os.makedirs(os.path.join(root, 'img'))
+            path = os.path.join(root, 'img', 'banner.jpg')
+            with open(path, 'wb') as f:
+                f.write(b'legacy')
+            service = Service.objects.create(title='Банер', description='Друк', image='img/banner.jpg')
+            news = News.objects.create(title='Новина', content='Текст', image='img/banner.jpg')
+            with self.captureOnCommitCallbacks(execute=True):
+                service.delete()
+                news.image = ContentFile(b'new bytes', name='c.jpg')
+                news.save()
+            self.assertTrue(os.path.exists(path))
+
+
+class ImageVariantTests(TestCase):
+    """Варіанти для карток пишуться у звичайне сховище під своїми іменами й знаходяться шаблоном."""
+
+    def test_variants_are_found_and_not_reference_counted(self):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (1200, 800), 'orange').save(buffer, 'JPEG')
+        with tempfile.TemporaryDirectory() as root, override_settings(MEDIA_ROOT=root):
+            service = Service.objects.create(title='Банер', description='Друк',
+                                             image=ContentFile(buffer.getvalue(), name='banner.jpg'))
+            self.assertEqual(generate_variants(service.image), 4)
+            srcset, webp_srcset, fallback = variant_srcsets(service.image)
+            self.assertRegex(srcset, r'/thumbs/.+ 400w, .+ 800w$')
+            self.assertRegex(webp_srcset, r'\.webp 400w, .+\.webp 800w$')
+            self.assertTrue(fallback)
+            self.assertEqual(list(MediaBlob.objects.values_list('name', flat=True)), [service.image.name])
+            self.assertEqual(generate_variants(service.image), 0)
+
+            thumbs = os.path.join(os.path.dirname(service.image.path), 'thumbs')
+            self.assertEqual(len(os.listdir(thumbs)), 4)
+            with self.captureOnCommitCallbacks(execute=True):
+                service.delete()
+            self.assertEqual(os.listdir(thumbs), [])
+
+
+class ImageJobTests(TestCase):
+    """Черга обробки фото: вибір завдань, повтори з затримкою, завислі завдання."""
+
+    def job(self, **fields):
+        return ImageJob.objects.create(model_label='main.Service', object_id=1, **fields)
+
+    def test_claim_jobs_takes_due_pending_jobs_once(self):
+        now = timezone.now()
+        first = self.job(run_after=now - timedelta(minutes=2))
+        second = self.job(run_after=now - timedelta(minutes=1))
+        third = self.job()
+        self.job(run_after=now + timedelta(minutes=5))
+        self.job(status=ImageJob.RUNNING)
+        self.job(status=ImageJob.DONE)
+
+        self.assertEqual([job[0] for job in claim_jobs(2)], [first.id, second.id])
+        self.assertEqual([job[0] for job in claim_jobs(2)], [third.id])
+        self.assertEqual(claim_jobs(2), [])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), (ImageJob.RUNNING, 1))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = self.job()
+        for attempt, delay in ((1, 30), (2, 60), (3, 120)):
+            ImageJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            self.assertEqual([claimed[0] for claimed in claim_jobs(1)], [job.id])
+            started = timezone.now()
+            record_result(job.id, 'Traceback: помилка')
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts, job.last_error), (ImageJob.PENDING, attempt, 'Traceback: помилка'))
+            self.assertAlmostEqual((job.run_after - started).total_seconds(), delay, delta=5)
+            self.assertEqual(claim_jobs(1), [])
+
+    def test_job_fails_after_max_attempts_and_success_clears_error(self):
+        job = self.job(status=ImageJob.RUNNING, attempts=MAX_ATTEMPTS)
+        record_result(job.id, 'помилка')
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageJob.FAILED)
+        self.assertEqual(claim_jobs(1), [])
+
+        job = self.job(status=ImageJob.RUNNING, attempts=1, last_error='стара помилка')
+        record_result(job.id, None)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (ImageJob.DONE, ''))
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale = self.job(status=ImageJob.RUNNING)
+        fresh = self.job(status=ImageJob.RUNNING)
+        ImageJob.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=15)), 1)
+        self.assertEqual(ImageJob.objects.get(pk=stale.pk).status, ImageJob.PENDING)
+        self.assertEqual(ImageJob.objects.get(pk=fresh.pk).status, ImageJob.RUNNING)
+
+
+class ImageWorkerTests(TransactionTestCase):
+    """run_image_worker виконує завдання в пулі процесів (дочірні процеси бачать закомічені рядки)."""
+
+    def test_worker_pool_generates_variants(self):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (1200, 800), 'orange').save(buffer, 'JPEG')
+        with tempfile.TemporaryDirectory() as root, override_settings(MEDIA_ROOT=root):
+            service = Service.objects.create(title='Банер', description='Друк',
+                                             image=ContentFile(buffer.getvalue(), name='banner.jpg'))
+            job = ImageJob.objects.get(object_id=service.pk)
+            call_command('run_image_worker', once=True, workers=1, stdout=StringIO(), stderr=StringIO())
+            job.refresh_from_db()
+            self.assertEqual(job.status, ImageJob.DONE, job.last_error)
+            self.assertEqual(generate_variants(service.image), 0)
+
+
+class OrderStatusTests(TestCase):
+    """Масова зміна статусів: дозволені переходи, історія, сталий набір запитів."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        customer = User.objects.create_user('client', password='x')
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        ServiceOrder.objects.bulk_create([ServiceOrder(user=customer, service=service) for _ in range(30)])
+        ServiceOrder.objects.filter(pk__in=ServiceOrder.objects.order_by('pk')[:5].values('pk')).update(
+            status=ServiceOrder.DONE,
+        )
+
+    def test_bulk_transition_skips_forbidden_and_logs_history(self):
+        self.client.force_login(self.staff)
+        response = self.client.post(reverse('admin_order_list'), {'to_status': ServiceOrder.IN_PROGRESS, 'scope': 'filtered'})
+        self.assertRedirects(response, reverse('admin_order_list'))
+        # «Виконано» → «В роботі» заборонено
+        self.assertEqual(ServiceOrder.objects.filter(status=ServiceOrder.IN_PROGRESS).count(), 25)
+        self.assertEqual(ServiceOrder.objects.filter(status=ServiceOrder.DONE).count(), 5)
+        self.assertEqual(ServiceOrderHistory.objects.filter(changed_by=self.staff, to_status=ServiceOrder.IN_PROGRESS).count(), 25)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        def queries(orders):
+            with CaptureQueriesContext(connection) as ctx:
+                ServiceOrder.bulk_transition(orders, ServiceOrder.CANCELLED, changed_by=self.staff)
+            return len(ctx.captured_queries)
+
+        ids = list(ServiceOrder.objects.filter(status=ServiceOrder.NEW).values_list('pk', flat=True))
+        self.assertEqual(queries(ServiceOrder.objects.filter(pk__in=ids[:2])),
+                         queries(ServiceOrder.objects.filter(pk__in=ids[2:])))
+
+    def test_status_changed_after_select_is_not_overwritten(self):
+        new = ServiceOrder.objects.filter(status=ServiceOrder.NEW)
+        victim = new.order_by('pk').first()
+        raced = []
+
+        def change_concurrently(execute, sql, params, many, context):
+            # Імітація іншого процесу: статус змінюється між SELECT і UPDATE
+            if sql.startswith('UPDATE') and not raced:
+                raced.append(sql)
+                execute('UPDATE main_serviceorder SET status = %s WHERE id = %s',
+                        [ServiceOrder.DONE, victim.pk], False, context)
+            return execute(sql, params, many, context)
+
+        expected = new.count() - 1
+        with connection.execute_wrapper(change_concurrently):
+            changed = ServiceOrder.bulk_transition(new, ServiceOrder.IN_PROGRESS, changed_by=self.staff)
+        self.assertEqual(changed, expected)
+        victim.refresh_from_db()
+        self.assertEqual(victim.status, ServiceOrder.DONE)
+        self.assertFalse(victim.history.exists())
+        self.assertEqual(ServiceOrderHistory.objects.filter(to_status=ServiceOrder.IN_PROGRESS).count(), expected)
+
+
+class ExportTests(TestCase):
+    """Потокове вивантаження: CSV/JSONL, gzip, фільтр дат, доступ лише персоналу."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        customer = User.objects.create_user('client', password='x', email='c@example.com')
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        ServiceOrder.objects.bulk_create([ServiceOrder(user=customer, service=service) for _ in range(5)])
+
+    def test_orders_csv_and_gzipped_jsonl(self):
+        url = reverse('admin_export', args=['orders'])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url, {'format': 'csv'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertIn('Банер', lines[1])
+
+        response = self.client.get(url, {'format': 'jsonl', 'gzip': '1'})
+        rows = [json.loads(line) for line in gzip.decompress(b''.join(response.streaming_content)).splitlines()]
+        self.assertEqual([row['user__email'] for row in rows], ['c@example.com'] * 5)
+
+        response = self.client.get(url, {'format': 'csv', 'from': '2000-01-01', 'to': '2000-12-31'})
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 1)
+
+
+class LoginThrottleTests(TestCase):
+    """Ліміт спроб входу до хешування пароля і перехешування старих паролів."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='client', email='client@example.com',
+                                        password=make_password('secret-pass', hasher='pbkdf2_sha256'))
+
+    @override_settings(THROTTLE_RATES={'login-ip': (100, 60), 'login-email': (3, 300)})
+    def test_failed_attempts_are_throttled_per_email(self):
+        for _ in range(3):
+            self.assertEqual(self.client.post(reverse('login'), {'email': 'client@example.com', 'password': 'x'}).status_code, 302)
+        response = self.client.post(reverse('login'), {'email': 'Client@example.com', 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        # Інший email з тієї ж адреси не заблоковано
+        self.assertEqual(self.client.post(reverse('login'), {'email': 'other@example.com', 'password': 'x'}).status_code, 302)
+
+    @override_settings(THROTTLE_RATES={'login-ip': (100, 60), 'login-email': (3, 300)})
+    def test_other_domains_share_the_account_limit(self):
+        # Вхід іде за частиною до @, тож інші домени — ті самі спроби для того самого акаунта
+        for domain in ('a.com', 'b.com', 'c.com'):
+            self.client.post(reverse('login'), {'email': f'client@{domain}', 'password': 'x'})
+        response = self.client.post(reverse('login'), {'email': 'client@example.com', 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        response = self.client.post(reverse('login'), {'email': 'client@example.com', 'password': 'secret-pass'})
+        self.assertRedirects(response, reverse('profile'), fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$32768$'))
+
+
+class SessionTests(TestCase):
+    """Сесія з кешу і користувач разом із профілем; пакетне прибирання прострочених сесій."""
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_session_user_with_profile_in_one_query(self):
+        user = User.objects.create_user('client', password='x')
+        UserProfile.objects.create(user=user, phone='+380501112233')
+        cache.clear()
+        self.client.force_login(user)
+
+        request = RequestFactory().get('/')
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(self.client.session.session_key)
+        # Сесія — з кешу, користувач і профіль — одним запитом
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user(request).profile.phone, '+380501112233')
+
+    def test_sessions_from_model_backend_stay_valid(self):
+        user = User.objects.create_user('client', password='x')
+        self.client.force_login(user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+
+    def test_failed_login_checks_password_once(self):
+        User.objects.create_user('client', password='secret-pass')
+        with mock.patch('django.contrib.auth.backends.ModelBackend.authenticate', autospec=True,
+                        side_effect=ModelBackend.authenticate) as authenticate:
+            self.client.post(reverse('login'), {'email': 'client@example.com', 'password': 'wrong'})
+        self.assertEqual(authenticate.call_count, 1)
+
+    def test_clear_expired_sessions(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f'old{i}', session_data='', expire_date=now - timedelta(days=1)) for i in range(5)]
+            + [Session(session_key='alive', session_data='', expire_date=now + timedelta(days=1))]
+        )
+        call_command('clear_expired_sessions', batch_size=2, sleep=0, stdout=StringIO())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['alive'])
+
+
+@override_settings(ROLLUP_SETTLE_SECONDS=0)
+class DashboardRollupTests(TestCase):
+    """Інкрементне оновлення зведень дає той самий результат, що й повна перебудова."""
+
+    def snapshot(self):
+        return (
+            sorted(DailyServiceStat.objects.values_list('day', 'service_id', 'orders')),
+            sorted(DailyStat.objects.values_list('day', 'new_users', 'responses')),
+            dict(OrderStatusStat.objects.exclude(orders=0).values_list('status', 'orders')),
+        )
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        staff = User.objects.create_user('admin', password='x', is_staff=True)
+        customer = User.objects.create_user('client', password='x')
+        service = Service.objects.create(title='Банер', description='Друк банерів')
+        orders = ServiceOrder.objects.bulk_create([ServiceOrder(user=customer, service=service) for _ in range(4)])
+        question = SupportChat.objects.create(user=customer, sender=customer, message='Коли буде готово?')
+        SupportChat.objects.filter(pk=question.pk).update(created_at=timezone.now() - timedelta(minutes=10))
+        refresh_rollups()
+
+        orders[0].transition_to(ServiceOrder.IN_PROGRESS, changed_by=staff)
+        ServiceOrder.objects.create(user=customer, service=service).transition_to(ServiceOrder.CANCELLED, changed_by=staff)
+        SupportChat.objects.create(user=customer, sender=staff, message='Завтра', is_admin=True)
+        refresh_rollups()
+
+        incremental = self.snapshot()
+        self.assertEqual(incremental[2], {ServiceOrder.NEW: 3, ServiceOrder.IN_PROGRESS: 1, ServiceOrder.CANCELLED: 1})
+        stat = DailyStat.objects.get(day=timezone.localdate())
+        self.assertEqual(stat.responses, 1)
+        self.assertAlmostEqual(stat.response_seconds, 600, delta=5)
+
+        refresh_rollups(full=True)
+        self.assertEqual(self.snapshot(), incremental)
+
+        processed = refresh_rollups(full=True, batch_size=1)
+        self.assertEqual(self.snapshot(), incremental)
+        self.assertEqual(processed['orders'], ServiceOrder.objects.latest('id').id)
+
+    def test_refresh_locks_watermarks(self):
+        # На SQLite FOR UPDATE не генерується (там серіалізує BEGIN IMMEDIATE), тож перевіряємо сам виклик
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True,
+                               side_effect=QuerySet.select_for_update) as select_for_update:
+            refresh_rollups()
+        self.assertEqual(select_for_update.call_args.args[0].model, RollupWatermark)
+        self.assertEqual(RollupWatermark.objects.count(), len(SOURCES))
+
+
+class ExcerptTests(TestCase):
+    """Короткий текст зберігається при save(), а списки не читають повний текст."""
+
+    def test_excerpt_saved_and_listing_skips_text_column(self):
+        service = Service.objects.create(title='Банер', description=' '.join(f'слово{i}' for i in range(40)))
+        self.assertEqual(service.excerpt, ' '.join(f'слово{i}' for i in range(20)) + ' …')
+        service.description = 'Друк банерів будь-якого розміру'
+        service.save(update_fields=['description'])
+        service.refresh_from_db()
+        self.assertEqual(service.excerpt, 'Друк банерів будь-якого розміру')
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('catalog'))
+        self.assertContains(response, 'Друк банерів будь-якого розміру')
+        self.assertFalse(any('"description"' in query['sql'] for query in ctx.captured_queries))
+
+    def test_news_cards_render_stored_excerpt(self):
+        words = [f'слово{i}' for i in range(40)]
+        news = News.objects.create(title='Новина', content=' '.join(words))
+        self.assertEqual(news.excerpt, ' '.join(words[:20]) + ' …')
+        cache.clear()
+        for name in ('home', 'news'):
+            response = self.client.get(reverse(name))
+            self.assertContains(response, news.excerpt)
+            self.assertNotContains(response, 'слово20')
+
+
+class AdminUserListTests(TestCase):
+    """Список користувачів: підсумки по замовленнях і чату без N+1, фільтри."""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user('admin', password='x', is_staff=True)
+        self.service = Service.objects.create(title='Банер', description='Друк банерів')
+
+    def add_customer(self, username, orders=0):
+        customer = User.objects.create_user(username, password='x')
+        UserProfile.objects.create(user=customer, phone='+380501112233')
+        ServiceOrder.objects.bulk_create([ServiceOrder(user=customer, service=self.service) for _ in range(orders)])
+        return customer
+
+    def get_list(self, params=''):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('admin_user_list') + params)
+        return response, len(ctx.captured_queries)
+
+    def test_annotations_in_constant_queries(self):
+        customer = self.add_customer('client', orders=2)
+        SupportChat.objects.create(user=customer, sender=customer, message='Привіт')
+        self.client.force_login(self.staff)
+        self.get_list()  # прогрів: сесія й лічильник непрочитаних потрапляють у кеш
+        response, queries = self.get_list('?has_orders=1')
+        [row] = response.context['users']
+        self.assertEqual((row.order_count, row.unread_count, row.profile.phone), (2, 1, '+380501112233'))
+        self.assertIsNotNone(row.last_order_at)
+
+        for i in range(5):
+            self.add_customer(f'client{i}', orders=i)
+        response, more_queries = self.get_list()
+        self.assertEqual(len(response.context['users']), 7)
+        self.assertEqual(more_queries, queries)
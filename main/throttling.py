@@ -0,0 +1,96 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+THROTTLE_KEY_PREFIX = 'throttle'
+
+
+class SlidingWindowThrottle:
+    """
+    🔒 Не більше ``limit`` спроб за ``window`` секунд для одного ключа (IP, email).
+    Ковзне вікно рахується двома лічильниками в кеші: поточне фіксоване вікно
+    плюс попереднє, зважене часткою, що ще потрапляє у ковзне. Пам'ять — два
+    числа на ключ, перевірка — один get_many.
+    """
+
+    def __init__(self, scope, limit, window):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def _key(self, ident, bucket):
+        # Хеш замість сирого email: ключі кешу мають обмеження на довжину й символи
+        digest = hashlib.sha256(str(ident).encode()).hexdigest()[:32]
+        return f'{THROTTLE_KEY_PREFIX}:{self.scope}:{digest}:{bucket}'
+
+    def _buckets(self, now):
+        bucket = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+        return bucket, elapsed
+
+    def count(self, ident, now=None):
+        bucket, elapsed = self._buckets(time.time() if now is None else now)
+        current_key, previous_key = self._key(ident, bucket), self._key(ident, bucket - 1)
+        values = cache.get_many([current_key, previous_key])
+        return values.get(previous_key, 0) * (1 - elapsed) + values.get(current_key, 0)
+
+    def retry_after(self, ident, now=None):
+        """0, якщо спробу дозволено, інакше скільки секунд чекати (з запасом)."""
+        now = time.time() if now is None else now
+        if self.count(ident, now) < self.limit:
+            return 0
+        return max(1, math.ceil(self.window - now % self.window))
+
+    def hit(self, ident, now=None):
+        bucket, _ = self._buckets(time.time() if now is None else now)
+        key = self._key(ident, bucket)
+        # Лічильник живе два вікна: у наступному він стає «попереднім»
+        cache.add(key, 0, timeout=self.window * 2)
+        try:
+            cache.incr(key)
+        except ValueError:  # ключ встиг зникнути між add та incr
+            cache.set(key, 1, timeout=self.window * 2)
+
+    def reset(self, ident, now=None):
+        bucket, _ = self._buckets(time.time() if now is None else now)
+        cache.delete_many([self._key(ident, bucket), self._key(ident, bucket - 1)])
+
+
+def get_throttle(scope):
+    """Обмежувач із THROTTLE_RATES або None, якщо для scope ліміт не задано."""
+    rate = getattr(settings, 'THROTTLE_RATES', {}).get(scope)
+    return SlidingWindowThrottle(scope, *rate) if rate else None
+
+
+def check_throttles(*checks):
+    """
+    Перевіряє пари (scope, ключ) без збільшення лічильників; повертає найбільше
+    очікування в секундах або 0. Викликається до дорогого хешування пароля.
+    """
+    wait = 0
+    for scope, ident in checks:
+        throttle = get_throttle(scope)
+        if throttle is not None and ident:
+            wait = max(wait, throttle.retry_after(ident))
+    return wait
+
+
+def hit_throttle(scope, ident):
+    throttle = get_throttle(scope)
+    if throttle is not None and ident:
+        throttle.hit(ident)
+
+
+def reset_throttle(scope, ident):
+    throttle = get_throttle(scope)
+    if throttle is not None and ident:
+        throttle.reset(ident)
+
+
+def client_ip(request):
+    # За зворотним проксі REMOTE_ADDR має виставляти сервер (uvicorn --proxy-headers,
+    # gunicorn forwarded_allow_ips): X-Forwarded-For від клієнта легко підробити
+    return request.META.get('REMOTE_ADDR', '')
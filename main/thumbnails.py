@@ -0,0 +1,75 @@
+from django.conf import settings
+from easy_thumbnails.files import get_thumbnailer
+
+# Варіанти для карток: ширина → опції easy-thumbnails (висота карток у шаблонах — 220px)
+CARD_VARIANTS = getattr(settings, 'CARD_IMAGE_VARIANTS', {
+    400: {'size': (400, 220), 'crop': 'smart'},
+    800: {'size': (800, 440), 'crop': 'smart'},
+})
+FORMATS = ('default', 'webp')
+
+
+def _thumbnailer(source, fmt, relative_name=None):
+    thumbnailer = get_thumbnailer(source, relative_name)
+    if fmt == 'webp':
+        thumbnailer.thumbnail_extension = 'webp'
+        thumbnailer.thumbnail_transparency_extension = 'webp'
+        thumbnailer.thumbnail_preserve_extensions = None
+    return thumbnailer
+
+
+def variant_name(fieldfile, width, fmt='default'):
+    """Ім’я файлу варіанта; обчислюється без звернення до диска чи бази."""
+    thumbnailer = _thumbnailer(fieldfile, fmt)
+    return thumbnailer.get_thumbnail_name(thumbnailer.get_options(CARD_VARIANTS[width]))
+
+
+def generate_variants(fieldfile, force=False):
+    """Створює всі розміри у вихідному форматі та у WebP. Повертає кількість нових файлів."""
+    created = 0
+    for width, options in CARD_VARIANTS.items():
+        for fmt in FORMATS:
+            thumbnailer = _thumbnailer(fieldfile, fmt)
+            storage = thumbnailer.thumbnail_storage
+            name = variant_name(fieldfile, width, fmt)
+            if not force and storage.exists(name):
+                continue
+            thumbnail = thumbnailer.generate_thumbnail(thumbnailer.get_options(options))
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, thumbnail)
+            created += 1
+    return created
+
+
+def delete_variants(storage, name):
+    """Видаляє варіанти файлу ``name`` зі ``storage`` разом із ним самим. Повертає кількість видалених."""
+    deleted = 0
+    for width, options in CARD_VARIANTS.items():
+        for fmt in FORMATS:
+            thumbnailer = _thumbnailer(storage, fmt, name)
+            variant = thumbnailer.get_thumbnail_name(thumbnailer.get_options(options))
+            if thumbnailer.thumbnail_storage.exists(variant):
+                thumbnailer.thumbnail_storage.delete(variant)
+                deleted += 1
+    return deleted
+
+
+def variant_srcsets(fieldfile):
+    """
+    Повертає (srcset вихідного формату, srcset WebP, найменший URL) лише з
+    уже згенерованих варіантів. Якщо варіантів ще немає — шаблон покаже оригінал.
+    """
+    storage = get_thumbnailer(fieldfile).thumbnail_storage
+    srcsets = {fmt: [] for fmt in FORMATS}
+    for width in sorted(CARD_VARIANTS):
+        for fmt in FORMATS:
+            name = variant_name(fieldfile, width, fmt)
+            if storage.exists(name):
+                srcsets[fmt].append((storage.url(name), width))
+    fallback = srcsets['default'][0][0] if srcsets['default'] else None
+    return (
+        ', '.join(f'{url} {width}w' for url, width in srcsets['default']),
+        ', '.join(f'{url} {width}w' for url, width in srcsets['webp']),
+        fallback,
+    )
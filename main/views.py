@@ -1,96 +1,215 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required, user_passes_test
-from .models import Service, News, Contact, Order, SupportChat, ServiceOrder, UserProfile
+from .models import Service, News, Contact, SupportChat, ServiceOrder, UserProfile, SupportConversation, CHAT_PAGE_SIZE
+from .caching import aget_content_version, cache_public_page
+from .counters import aunread_count
+from .exports import EXPORTS, FORMATS, aiterate, export_stream
+from .pagination import akeyset_paginate, keyset_paginate
+from .perf import collect_stats
+from .realtime import publish_unread_count, serialize_message
+from .rollups import DASHBOARD_DAYS, dashboard_data
+from .search import SearchResults, get_search_backend
+from .throttling import check_throttles, client_ip, hit_throttle, reset_throttle
 from django.contrib import messages
 from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Max, Q
-from django.http import JsonResponse
-
-
-# 🔒 Декоратор, який дозволяє доступ лише адміністраторам
+from django.template.loader import render_to_string
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.core.paginator import Paginator
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+
+SUPPORT_LIST_PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 12
+CATALOG_PAGE_SIZE = 12
+NEWS_PAGE_SIZE = 12
+USER_LIST_PAGE_SIZE = 50
+# Сортування списку користувачів — лише за індексованими колонками auth_user,
+# щоб keyset-сторінка читала ~50 рядків індексу навіть на сотнях тисяч користувачів
+USER_LIST_SORTS = {
+    'old': ("Спочатку давні", ('date_joined', 'id')),
+    'new': ("Спочатку нові", ('-date_joined', '-id')),
+    'username': ("За логіном", ('username',)),
+}
+ORDER_LIST_PAGE_SIZE = 50
+
+
+# 🔒 Декоратор, який дозволяє доступ лише адміністраторам (підходить і для async view)
 def admin_required(view_func):
     return user_passes_test(lambda u: u.is_staff)(view_func)
 
 
+async def arender(request, template_name, context=None):
+    """
+    render() для async view. Дані вже вибрані async ORM, а шаблон рендериться в потоці:
+    контекст-процесори читають сесію, користувача й повідомлення синхронно.
+    """
+    return await sync_to_async(render)(request, template_name, context)
+
+
 @admin_required
 def admin_support_list(request):
-    # Отримуємо список користувачів, які писали у підтримку
-    users_with_messages = (
-        SupportChat.objects
-        .values('user')
-        .annotate(last_message=Max('created_at'))
-        .order_by('-last_message')
+    # Підсумки розмов підтримуються сигналами, тож сторінка — це один запит
+    conversations = SupportConversation.objects.select_related('user')
+    page = keyset_paginate(
+        conversations, ('-last_time', '-user_id'),
+        cursor=request.GET.get('after'), per_page=SUPPORT_LIST_PAGE_SIZE,
     )
 
-    # Отримуємо об’єкти користувачів
-    user_data = []
-    for entry in users_with_messages:
-        u = User.objects.get(id=entry['user'])
-        last_msg = SupportChat.objects.filter(user=u).order_by('-created_at').first()
-        user_data.append({
-            'user': u,
-            'last_message': last_msg.message[:50] + ('...' if len(last_msg.message) > 50 else ''),
-            'last_time': last_msg.created_at
-        })
+    return render(request, "admin_support_list.html", {"user_data": page.items, "page": page, })
+
 
-    return render(request, "admin_support_list.html", {"user_data": user_data, })
+@admin_required
+def admin_dashboard(request):
+    """Панель персоналу зі зведених таблиць (оновлює `manage.py refresh_dashboard`)"""
+    days = request.GET.get('days', '')
+    days = min(int(days), 365) if days.isdigit() and int(days) > 0 else DASHBOARD_DAYS
+    return render(request, "admin_dashboard.html", dashboard_data(days))
+
+
+@admin_required
+def admin_perf_stats(request):
+    """Зведена статистика продуктивності view (див. main/perf.py)"""
+    return JsonResponse(collect_stats(), json_dumps_params={'ensure_ascii': False})
 
 
 @admin_required
-def get_unread_count(request):
+async def get_unread_count(request):
     """Повертає кількість непрочитаних повідомлень для AJAX-запиту"""
-    count = SupportChat.objects.filter(is_read=False).count()
-    return JsonResponse({'count': count})
+    return JsonResponse({'count': await aunread_count()})
 
 
 @admin_required
 def admin_chat_view(request, user_id):
-    target_user = User.objects.get(pk=user_id)
-    chat_messages = SupportChat.objects.filter(user=target_user).order_by('created_at')
-    SupportChat.objects.filter(is_read=False).update(is_read=True)
+    target_user = get_object_or_404(User, pk=user_id)
 
     if request.method == "POST":
         text = request.POST.get("message", "").strip()
         if text:
-            SupportChat.objects.create(
-                user=target_user,
-                sender=request.user,
-                message=text,
-                is_admin=True
-            )
+            SupportChat.post(target_user.id, request.user, text, is_admin=True)
         return redirect("admin_chat", user_id=user_id)
 
+    # Позначаємо прочитаними лише повідомлення цієї розмови
+    if SupportChat.mark_thread_read(target_user.id):
+        publish_unread_count()
+
+    # Лише останні повідомлення; старіші підвантажуються через chat_messages_api
+    chat_messages, chat_has_more = SupportChat.thread_window(target_user.id)
     return render(request, "admin_chat.html", {
         "target_user": target_user,
         "chat_messages": chat_messages,
+        "chat_has_more": chat_has_more,
+    })
+
+
+def _parse_message_id(value):
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
 
+
+@login_required
+def chat_messages_api(request, user_id):
+    """
+    GET — порція повідомлень розмови (?before=<id> або ?after=<id>),
+    POST — нове повідомлення; у відповідь повертається лише створений рядок.
+    """
+    if not (request.user.is_staff or request.user.id == user_id):
+        return JsonResponse({'error': 'forbidden'}, status=403)
+
+    if request.method == "POST":
+        text = request.POST.get("message", "").strip()
+        if not text:
+            return JsonResponse({'error': 'empty'}, status=400)
+        if request.user.id != user_id:
+            get_object_or_404(User, pk=user_id)
+        msg = SupportChat.post(user_id, request.user, text, is_admin=request.user.is_staff)
+        return JsonResponse({'message': serialize_message(msg)}, status=201)
+
+    limit = max(1, min(_parse_message_id(request.GET.get('limit')) or CHAT_PAGE_SIZE, CHAT_PAGE_SIZE * 4))
+    chat_messages, has_more = SupportChat.thread_window(
+        user_id,
+        before=_parse_message_id(request.GET.get('before')),
+        after=_parse_message_id(request.GET.get('after')),
+        limit=limit,
+    )
+    return JsonResponse({
+        'messages': [serialize_message(msg) for msg in chat_messages],
+        'has_more': has_more,
     })
 
 
-def home(request):
-    services = Service.objects.all()[:3]
-    news = News.objects.order_by('-date')[:3]
+# .only(): картки показують excerpt, повний текст з бази не читається
+def _service_cards():
+    return Service.objects.only(*Service.LIST_FIELDS)
 
-    return render(request, "index.html", {"services": services, "news": news, })
 
+def _news_cards():
+    return News.objects.only(*News.LIST_FIELDS)
 
-def catalog(request):
-    services = Service.objects.all()
 
-    return render(request, "catalog.html", {"services": services, })
+def _catalog_query(request):
+    """Аргументи keyset_paginate каталогу — спільні для сторінки й підвантаження карток."""
+    return _service_cards(), ('id',), request.GET.get('after'), CATALOG_PAGE_SIZE
+
+
+def _news_query(request):
+    return _news_cards(), ('-date', '-id'), request.GET.get('after'), NEWS_PAGE_SIZE
+
+
+@cache_public_page
+async def home(request):
+    # Ліниві queryset: запити виконуються під час рендеру лише тоді, коли
+    # фрагменти home_services / home_news не знайдено в кеші
+    return await arender(request, "index.html", {
+        "services": _service_cards()[:3],
+        "news": _news_cards().order_by('-date', '-id')[:3],
+        "content_version": await aget_content_version(),
+    })
+
 
+@cache_public_page
+async def catalog(request):
+    page = await akeyset_paginate(*_catalog_query(request))
 
+    return await arender(request, "catalog.html", {"services": page.items, "page": page, })
+
+
+@cache_public_page
+def catalog_page(request):
+    """Наступна порція карток каталогу для нескінченного прокручування"""
+    page = keyset_paginate(*_catalog_query(request))
+    html = render_to_string("catalog_cards.html", {"services": page.items}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
+
+@cache_public_page
 def service_detail(request, service_id):
     service = get_object_or_404(Service, id=service_id)
     return render(request, "service_detail.html", {"service": service, })
 
 
-def news_list(request):
-    news = News.objects.all().order_by('-date')
-    return render(request, "news.html", {"news": news, })
+@cache_public_page
+async def news_list(request):
+    page = await akeyset_paginate(*_news_query(request))
+    return await arender(request, "news.html", {"news": page.items, "page": page, })
 
 
+@cache_public_page
+def news_page(request):
+    """Наступна порція новин для нескінченного прокручування"""
+    page = keyset_paginate(*_news_query(request))
+    html = render_to_string("news_cards.html", {"news": page.items}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': page.next_cursor})
+
+
+@cache_public_page
 def news_detail(request, news_id):
     news_item = get_object_or_404(News, id=news_id)
     return render(request, "news_detail.html", {"news": news_item})
@@ -101,6 +220,7 @@ def news(request):
     return render(request, "news.html", {"news_list": news_list})
 
 
+@cache_public_page
 def contacts(request):
     contact = Contact.objects.all()
     return render(request, "contacts.html", {"contacts": contact})
@@ -110,8 +230,21 @@ def cart(request):
     return render(request, "cart.html", {})
 
 
+def _throttled(request, template_name, wait):
+    response = render(request, template_name, {"retry_after": wait}, status=429)
+    response["Retry-After"] = str(wait)
+    return response
+
+
 def register_view(request):
     if request.method == "POST":
+        # 🔒 Ліміт на IP перевіряється до create_user: хешування пароля — найдорожча частина
+        ip = client_ip(request)
+        wait = check_throttles(('register-ip', ip))
+        if wait:
+            return _throttled(request, "register.html", wait)
+        hit_throttle('register-ip', ip)
+
         first_name = request.POST.get("first_name")
         last_name = request.POST.get("last_name")
         email = request.POST.get("email")
@@ -143,15 +276,27 @@ def register_view(request):
 
 def login_view(request):
     if request.method == "POST":
-        email = request.POST.get("email")
+        email = request.POST.get("email", "")
         username = email.split("@")[0]
         password = request.POST.get("password")
+
+        # 🔒 Надто часті спроби відхиляються до authenticate(), тобто без хешування.
+        # Ліміт облікового запису — за логіном, який перевіряється: різні домени
+        # в email (victim@a.com, victim@b.com) не дають нових спроб для того самого акаунта
+        ip, account_key = client_ip(request), username.strip().lower()
+        wait = check_throttles(('login-ip', ip), ('login-email', account_key))
+        if wait:
+            return _throttled(request, "login.html", wait)
+        hit_throttle('login-ip', ip)
+
         user = authenticate(request, username=username, password=password)
 
         if user:
+            reset_throttle('login-email', account_key)
             login(request, user)
             return redirect("profile")
         else:
+            hit_throttle('login-email', account_key)
             messages.error(request, "Невірний логін або пароль.")
             return redirect("login")
 
@@ -166,24 +311,19 @@ def profile_view(request):
     else:
         orders = ServiceOrder.objects.filter(user=request.user).select_related('service').order_by('-created_at')
 
-    chat_messages = SupportChat.objects.filter(user=request.user).order_by('created_at')
-
     # 🔹 Відправлення повідомлення у чат
     if request.method == "POST" and "message" in request.POST:
         text = request.POST.get("message", "").strip()
         if text:
-            SupportChat.objects.create(
-                user=request.user,
-                sender=request.user,
-                message=text,
-                is_admin=request.user.is_staff
-            )
+            SupportChat.post(request.user.id, request.user, text, is_admin=request.user.is_staff)
             messages.success(request, "Повідомлення відправлено.")
         return redirect("profile")
 
+    chat_messages, chat_has_more = SupportChat.thread_window(request.user.id)
     return render(request, "profile.html", {
         "orders": orders,
         "chat_messages": chat_messages,
+        "chat_has_more": chat_has_more,
     })
 
 
@@ -217,14 +357,100 @@ def make_order(request):
     })
 
 
+def _parse_day(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def _filter_orders(params):
+    """Фільтри списку замовлень: статус, послуга, користувач (логін/email), дати."""
+    orders = ServiceOrder.objects.select_related('user', 'service')
+    status = params.get('status', '')
+    if status in dict(ServiceOrder.STATUS_CHOICES):
+        orders = orders.filter(status=status)
+    service_id = params.get('service', '')
+    if service_id.isdigit():
+        orders = orders.filter(service_id=int(service_id))
+    query = params.get('q', '').strip()
+    if query:
+        orders = orders.filter(Q(user__username__icontains=query) | Q(user__email__icontains=query))
+    date_from = _parse_day(params.get('from'))
+    if date_from:
+        orders = orders.filter(created_at__date__gte=date_from)
+    date_to = _parse_day(params.get('to'))
+    if date_to:
+        orders = orders.filter(created_at__date__lte=date_to)
+    return orders
+
+
+@admin_required
+def admin_order_list(request):
+    orders = _filter_orders(request.GET)
+
+    if request.method == "POST":
+        to_status = request.POST.get("to_status")
+        if to_status in dict(ServiceOrder.STATUS_CHOICES):
+            # 🔹 Або позначені замовлення, або всі, що відповідають фільтру — один UPDATE
+            if request.POST.get("scope") != "filtered":
+                ids = [int(pk) for pk in request.POST.getlist("order_ids") if pk.isdigit()]
+                orders = orders.filter(pk__in=ids)
+            changed = ServiceOrder.bulk_transition(orders, to_status, changed_by=request.user)
+            messages.success(request, f"Статус змінено для замовлень: {changed}")
+        return redirect(request.get_full_path())
+
+    page = keyset_paginate(orders, ('-created_at', '-id'),
+                           cursor=request.GET.get('after'), per_page=ORDER_LIST_PAGE_SIZE)
+    status_counts = dict(ServiceOrder.objects.values_list('status').annotate(n=Count('id')).order_by())
+
+    return render(request, "admin_order_list.html", {
+        "orders": page.items,
+        "page": page,
+        "statuses": [(code, label, status_counts.get(code, 0)) for code, label in ServiceOrder.STATUS_CHOICES],
+        "services": Service.objects.only('id', 'title').order_by('title'),
+        "filters": request.GET,
+    })
+
+
+@admin_required
+def admin_export(request, dataset):
+    """
+    🔹 Потокове вивантаження замовлень, користувачів або переписки підтримки:
+    ?format=csv|jsonl&gzip=1&from=YYYY-MM-DD&to=YYYY-MM-DD
+    """
+    fmt = request.GET.get('format', 'csv')
+    if dataset not in EXPORTS or fmt not in FORMATS:
+        raise Http404
+    compress = request.GET.get('gzip') == '1'
+    stream = export_stream(dataset, fmt, _parse_day(request.GET.get('from')),
+                           _parse_day(request.GET.get('to')), compress=compress)
+    if isinstance(request, ASGIRequest):
+        stream = aiterate(stream)
+
+    filename = f"{dataset}-{timezone.localdate():%Y-%m-%d}.{fmt}" + ('.gz' if compress else '')
+    response = StreamingHttpResponse(stream, content_type='application/gzip' if compress else FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
 @admin_required
 def admin_order_detail(request, order_id):
-    order = get_object_or_404(ServiceOrder, id=order_id)
+    order = get_object_or_404(ServiceOrder.objects.select_related('user', 'service'), id=order_id)
     user = order.user
 
+    if request.method == "POST":
+        if order.transition_to(request.POST.get("to_status"), changed_by=request.user):
+            messages.success(request, f"Новий статус: {order.get_status_display()}")
+        else:
+            messages.error(request, "Такий перехід статусу неможливий.")
+        return redirect('admin_order_detail', order_id=order.id)
+
     return render(request, "admin_order_detail.html", {
         "order": order,
         "user_info": user,
+        "history": order.history.select_related('changed_by')[:50],
     })
 
 
@@ -234,15 +460,55 @@ def user_order_detail(request, order_id):
     return render(request, "user_order_detail.html", {"order": order})
 
 
+def _filter_users(params):
+    """Фільтри списку користувачів: пошук, роль, наявність замовлень і непрочитаних."""
+    users = User.objects.all()
+    query = params.get('q', '').strip()
+    if query:
+        users = users.filter(
+            Q(username__icontains=query) | Q(email__icontains=query)
+            | Q(first_name__icontains=query) | Q(last_name__icontains=query)
+        )
+    role = params.get('role', '')
+    if role == 'staff':
+        users = users.filter(is_staff=True)
+    elif role == 'customers':
+        users = users.filter(is_staff=False)
+    if params.get('has_orders'):
+        users = users.filter(Exists(ServiceOrder.objects.filter(user=OuterRef('pk'))))
+    if params.get('unread'):
+        users = users.filter(support_conversation__unread_count__gt=0)
+    return users
+
+
 @admin_required
 def admin_user_list(request):
-    users = User.objects.all().order_by('date_joined')
-    return render(request, "admin_user_list.html", {"users": users})
+    sort = request.GET.get('sort', '')
+    if sort not in USER_LIST_SORTS:
+        sort = 'old'
+
+    # 🔹 Підсумки — корельовані підзапити по індексу serviceorder_user_idx: SQLite
+    # обчислює їх лише для рядків сторінки, тож уся сторінка — один запит
+    orders = ServiceOrder.objects.filter(user=OuterRef('pk')).order_by()
+    users = _filter_users(request.GET).select_related('profile').annotate(
+        order_count=Coalesce(Subquery(orders.values('user').annotate(n=Count('id')).values('n')), 0),
+        last_order_at=Subquery(orders.order_by('-created_at').values('created_at')[:1]),
+        unread_count=Coalesce('support_conversation__unread_count', 0),
+    )
+    page = keyset_paginate(users, USER_LIST_SORTS[sort][1],
+                           cursor=request.GET.get('after'), per_page=USER_LIST_PAGE_SIZE)
+    return render(request, "admin_user_list.html", {
+        "users": page.items,
+        "page": page,
+        "sorts": [(code, label) for code, (label, _) in USER_LIST_SORTS.items()],
+        "sort": sort,
+        "filters": request.GET,
+    })
 
 
 @admin_required
 def admin_user_detail(request, user_id):
-    user_info = get_object_or_404(User, id=user_id)
+    user_info = get_object_or_404(User.objects.select_related('profile'), id=user_id)
     orders = ServiceOrder.objects.filter(user=user_info).select_related('service').order_by('-created_at')
 
     return render(request, "admin_user_detail.html", {
@@ -251,22 +517,22 @@ def admin_user_detail(request, user_id):
     })
 
 
-def search(request):
+def _search_page(query, number):
+    # Ранжовані результати з повнотекстового індексу, по SEARCH_PAGE_SIZE на сторінку
+    results = SearchResults(get_search_backend(), query)
+    return Paginator(results, SEARCH_PAGE_SIZE).get_page(number)
+
+
+async def search(request):
     query = request.GET.get('q', '').strip()
-    services = []
-    news = []
+    page = None
 
     if query:
-        services = Service.objects.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
-        )
-        news = News.objects.filter(
-            Q(title__icontains=query) | Q(content__icontains=query)
-        )
+        # FTS5-запити сирі (MATCH, bm25), async ORM їх не має — виконуємо в потоці
+        page = await sync_to_async(_search_page)(query, request.GET.get('page'))
 
     context = {
         "query": query,
-        "services": services,
-        "news": news,
+        "page": page,
     }
-    return render(request, "search_results.html", context)
+    return await arender(request, "search_results.html", context)
@@ -2,6 +2,9 @@
 ASGI config for reklamnyresurs project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django, WebSocket connections (``/ws/support/...``) go to
+the support chat consumers in ``main.consumers``. Run it with any ASGI server,
+e.g. ``uvicorn reklamnyresurs.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +16,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'reklamnyresurs.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from main.consumers import websocket_application  # noqa: E402  (потрібен налаштований Django)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await websocket_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
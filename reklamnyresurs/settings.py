@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -37,11 +39,14 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'easy_thumbnails',
     'main',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'main.middleware.StaticFilesMiddleware',
+    'main.middleware.PerfStatsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -69,17 +74,161 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'reklamnyresurs.wsgi.application'
+ASGI_APPLICATION = 'reklamnyresurs.asgi.application'
+
+# Брокер подій чату підтримки для WebSocket-з'єднань (див. main/realtime.py).
+# InProcessBroker працює в межах одного ASGI-процесу; для кількох процесів
+# підставте власну реалізацію BaseBroker поверх спільного pub/sub — без неї
+# gunicorn.conf.py не запустить більше одного asgi-воркера.
+SUPPORT_CHAT_BROKER = os.environ.get('SUPPORT_CHAT_BROKER', 'main.realtime.InProcessBroker')
+
+# Пошуковий бекенд для /search/ (див. main/search.py). FTS5 є лише в SQLite,
+# для PostgreSQL нижче обирається 'main.search.SimpleSearchBackend'.
+SEARCH_BACKEND = 'main.search.SqliteFTS5Backend'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Типово LocMemCache — окремий у кожному процесі: лічильник непрочитаних, кеш сторінок,
+# обмеження спроб входу й сесії інших процесів не бачать. Спільний кеш для кількох
+# воркерів і команд задає CACHE_URL: redis://host:6379/0 (потрібен пакет redis)
+# або memcached://host:11211 (потрібен pymemcache).
+CACHE_URL = os.environ.get('CACHE_URL', '')
+SHARED_CACHE = bool(CACHE_URL)
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith('memcached://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': CACHE_URL.removeprefix('memcached://'),
+        }
+    }
+elif CACHE_URL:
+    raise ImproperlyConfigured(f"Непідтримуваний CACHE_URL: {CACHE_URL}")
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'reklamnyresurs',
+        }
+    }
+
+# Лічильник непрочитаних повідомлень зберігається в кеші (main/counters.py).
+# Обмежений час життя — страховка від розходження з базою: з LocMemCache лише вона
+# й працює, бо `manage.py reconcile_unread` звіряє кеш власного процесу.
+SUPPORT_UNREAD_CACHE_TIMEOUT = 300
+
+# Кеш публічних сторінок для анонімних відвідувачів (main/caching.py)
+PUBLIC_PAGE_CACHE_TIMEOUT = 300
+
+# Статистика продуктивності view (main/perf.py, /admin-perf/, `manage.py dump_perf_stats`)
+PERF_STATS_WINDOW = 1000  # скільки останніх запитів тримати для перцентилів
+PERF_STATS_N_PLUS_ONE_THRESHOLD = 10  # однаковий SQL частіше за це — ймовірно N+1
+PERF_STATS_FLUSH_SECONDS = 30
+PERF_STATS_DIR = BASE_DIR / 'perf'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# Профіль SQLite обирається змінною оточення SQLITE_PROFILE:
+#   production (типово) — WAL, synchronous=NORMAL, busy_timeout, mmap і постійні
+#                         з'єднання; записи починаються з BEGIN IMMEDIATE, тож
+#                         конкурентні записувачі чекають, а не падають з "database is locked";
+#   default             — стандартні налаштування Django.
+SQLITE_PROFILES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {},
+    },
+    'production': {
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=20000;'
+                'PRAGMA mmap_size=134217728;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        },
+    },
 }
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+
+# База обирається змінною оточення DJANGO_DB_ENGINE: sqlite (типово) або postgresql.
+# PostgreSQL потрібен для кількох gunicorn-воркерів із конкурентними записами;
+# залежності — requirements-postgres.txt, перенесення даних — `manage.py copy_sqlite_data`.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    POSTGRES_POOL_MAX_SIZE = int(os.environ.get('POSTGRES_POOL_MAX_SIZE', '10'))
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'reklamnyresurs'),
+            'USER': os.environ.get('POSTGRES_USER', 'reklamnyresurs'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+            # З пулом psycopg з'єднання повертаються в пул, тому CONN_MAX_AGE має бути 0;
+            # без пулу (POSTGRES_POOL_MAX_SIZE=0) — постійні з'єднання на воркер
+            'CONN_MAX_AGE': 0 if POSTGRES_POOL_MAX_SIZE else 600,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('POSTGRES_POOL_MIN_SIZE', '2')),
+                    'max_size': POSTGRES_POOL_MAX_SIZE,
+                    'timeout': int(os.environ.get('POSTGRES_POOL_TIMEOUT', '10')),
+                },
+            } if POSTGRES_POOL_MAX_SIZE else {},
+        }
+    }
+    SEARCH_BACKEND = 'main.search.SimpleSearchBackend'
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            **SQLITE_PROFILES[SQLITE_PROFILE],
+            # Файлова тестова база: WAL і конкурентні записи перевіряються в main/tests.py
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+
+# Під ASGI (gunicorn.conf.py, SERVER_PROFILE=asgi) кожен запит виконує синхронний код
+# у власному потоці, тож постійні з'єднання не перевикористовуються — лише пул PostgreSQL
+if os.environ.get('SERVER_PROFILE') == 'asgi':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+
+# Sessions
+# SESSION_MODE: cached_db — сесія читається з кешу, а в базу пишеться лише при зміні;
+# signed_cookies — без серверного сховища взагалі (дані підписані, але видимі клієнту,
+# а вихід не анулює вкрадену cookie); db — стандартне сховище Django.
+# cached_db типовий лише зі спільним кешем (CACHE_URL): з LocMemCache вихід чи cycle_key()
+# очищають кеш одного процесу, а інші далі приймали б стару сесію.
+# Прострочені сесії прибирає `manage.py clear_expired_sessions` (пакетами).
+SESSION_MODE = os.environ.get('SESSION_MODE', 'cached_db' if SHARED_CACHE else 'db')
+SESSION_ENGINE = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}[SESSION_MODE]
+
+# Користувач сесії завантажується разом із профілем (main/backends.py). ModelBackend
+# лишається другим, щоб сесії, створені ще з ним, не обривались після оновлення.
+AUTHENTICATION_BACKENDS = ['main.backends.ProfileModelBackend', 'django.contrib.auth.backends.ModelBackend']
 
 
 # Password validation
@@ -101,6 +250,36 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Хешування паролів: PASSWORD_HASHER_POLICY = scrypt (типово, стандартна бібліотека),
+# argon2 (потрібен argon2-cffi) або pbkdf2 (типовий для Django, найдорожчий для CPU).
+# Решта алгоритмів лишається в списку, щоб старі хеші перевірялись; при вході
+# пароль прозоро перехешовується обраним алгоритмом із поточною вартістю.
+PASSWORD_HASHER_POLICY = os.environ.get('PASSWORD_HASHER_POLICY', 'scrypt')
+PASSWORD_HASH_COST = {
+    # ~32 МБ пам'яті і ~0.15 с CPU на хеш проти ~0.5 с у PBKDF2 з 1 000 000 ітерацій
+    'scrypt': {'work_factor': int(os.environ.get('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 15)), 'block_size': 8, 'parallelism': 1},
+    'argon2': {'time_cost': 2, 'memory_cost': 64 * 1024, 'parallelism': 2},
+}
+_PASSWORD_HASHERS = {
+    'scrypt': 'main.hashers.TunedScryptPasswordHasher',
+    'argon2': 'main.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER_POLICY]] + [
+    hasher for policy, hasher in _PASSWORD_HASHERS.items() if policy != PASSWORD_HASHER_POLICY
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Обмеження спроб входу й реєстрації (main/throttling.py): scope -> (спроб, за секунд).
+# Перевіряється до хешування пароля. Лічильники в кеші: з LocMemCache вони окремі в кожному
+# процесі, і ліміт множився б на кількість воркерів, тому gunicorn.conf.py без CACHE_URL
+# запускає лише один воркер.
+THROTTLE_RATES = {
+    'login-ip': (30, 60),        # усі спроби входу з однієї IP-адреси
+    'login-email': (5, 300),     # невдалі спроби для одного логіна (частина email до @)
+    'register-ip': (10, 3600),   # реєстрації з однієї IP-адреси
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -118,6 +297,25 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
+# Продакшн: `manage.py collectstatic` збирає файли сюди з хешами в іменах і .gz/.br-варіантами,
+# а main.middleware.StaticFilesMiddleware віддає їх з immutable-кешуванням (STATIC_SERVE)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_SERVE = not DEBUG
+STATIC_MAX_AGE = 60  # для файлів без хешу в імені
+STATIC_MEMORY_CACHE_BYTES = 16 * 1024 * 1024
+
+STORAGES = {
+    # Завантаження зберігаються за sha256 вмісту без дублікатів (main/storage.py)
+    'default': {'BACKEND': 'main.storage.ContentAddressedStorage'},
+    # Зменшені копії мають власні імена (thumbs/…400x220…) і не рахуються в MediaBlob:
+    # easy-thumbnails інакше писав би їх через 'default' і не знаходив за іменем
+    'easy_thumbnails': {'BACKEND': 'easy_thumbnails.storage.ThumbnailFileSystemStorage'},
+    # У режимі DEBUG (і в тестах) — без маніфесту, щоб не вимагати collectstatic
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'main.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -126,3 +324,12 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/img/'
 MEDIA_ROOT = BASE_DIR / 'img'
+
+# Зменшені копії фото (easy-thumbnails, див. main/thumbnails.py)
+THUMBNAIL_SUBDIR = 'thumbs'
+THUMBNAIL_QUALITY = 82
+THUMBNAIL_PRESERVE_EXTENSIONS = ('png',)
+
+# Фонова черга обробки фото (main/tasks.py, `manage.py run_image_worker`)
+IMAGE_JOB_MAX_ATTEMPTS = 5
+IMAGE_JOB_RETRY_SECONDS = 30
@@ -3,13 +3,16 @@ from django.urls import path
 from main import views
 from django.conf import settings
 from django.conf.urls.static import static
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.home, name="home"),
     path('catalog/', views.catalog, name="catalog"),
+    path('catalog/page/', views.catalog_page, name='catalog_page'),
     path('catalog/<int:service_id>/', views.service_detail, name='service_detail'),
     path('news/', views.news_list, name='news'),
+    path('news/page/', views.news_page, name='news_page'),
     path('news/<int:news_id>/', views.news_detail, name='news_detail'),
     path('search/', views.search, name='search'),
     path('contacts/', views.contacts, name="contacts"),
@@ -19,14 +22,20 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.profile_view, name='profile'),
     path('admin-chat/<int:user_id>/', views.admin_chat_view, name='admin_chat'),
+    path('chat/<int:user_id>/messages/', views.chat_messages_api, name='chat_messages_api'),
     path('admin-support/', views.admin_support_list, name='admin_support_list'),
     path('order/', views.make_order, name='make_order'),
+    path('admin-orders/', views.admin_order_list, name='admin_order_list'),
+    path('admin-export/<str:dataset>/', views.admin_export, name='admin_export'),
     path('admin-order/<int:order_id>/', views.admin_order_detail, name='admin_order_detail'),
     path('order-detail/<int:order_id>/', views.user_order_detail, name='user_order_detail'),
     path('admin-users/', views.admin_user_list, name='admin_user_list'),
     path('admin-user/<int:user_id>/', views.admin_user_detail, name='admin_user_detail'),
     path('get_unread_count/', views.get_unread_count, name='get_unread_count'),
+    path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin-perf/', views.admin_perf_stats, name='admin_perf_stats'),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS[0])
+# Статика в DEBUG — через finders; у продакшні її віддає StaticFilesMiddleware
+urlpatterns += staticfiles_urlpatterns()
@@ -0,0 +1,39 @@
+// ♾ Підвантаження наступних карток (keyset-курсор) без перезавантаження сторінки.
+// Без JavaScript кнопка «Показати ще» працює як звичайне посилання на наступну сторінку.
+document.addEventListener("DOMContentLoaded", () => {
+  const button = document.getElementById("load-more");
+  const list = document.getElementById("card-list");
+  if (!button || !list) return;
+
+  let loading = false;
+  async function loadMore() {
+    if (loading || !button.dataset.cursor) return;
+    loading = true;
+    try {
+      const url = new URL(button.dataset.url, location.origin);
+      url.searchParams.set("after", button.dataset.cursor);
+      const response = await fetch(url, { headers: { "Accept": "application/json" } });
+      if (!response.ok) return;
+      const data = await response.json();
+      list.insertAdjacentHTML("beforeend", data.html);
+      if (data.next_cursor) {
+        button.dataset.cursor = data.next_cursor;
+        button.href = "?after=" + data.next_cursor;
+      } else {
+        button.remove();
+        observer.disconnect();
+      }
+    } finally {
+      loading = false;
+    }
+  }
+
+  button.addEventListener("click", (event) => {
+    event.preventDefault();
+    loadMore();
+  });
+  const observer = new IntersectionObserver((entries) => {
+    if (entries.some((entry) => entry.isIntersecting)) loadMore();
+  }, { rootMargin: "400px" });
+  observer.observe(button);
+});
@@ -0,0 +1,121 @@
+// 💬 Чат підтримки: показуємо лише останні повідомлення, старіші підвантажуємо
+// при прокручуванні вгору, нові приходять через WebSocket (або відповідь API).
+// Без JavaScript форма працює як звичайний POST.
+document.addEventListener("DOMContentLoaded", () => {
+  const chatBox = document.getElementById("chat-box");
+  const form = document.getElementById("chat-form");
+  if (!chatBox) return;
+  chatBox.scrollTop = chatBox.scrollHeight;
+
+  const apiUrl = chatBox.dataset.apiUrl;
+  const rendered = new Set(
+    Array.from(chatBox.querySelectorAll("[data-id]"), (row) => Number(row.dataset.id))
+  );
+  let hasMore = Boolean(chatBox.dataset.hasMore);
+
+  function buildRow(msg) {
+    const row = document.createElement("div");
+    row.className = "mb-2" + (msg.is_admin ? " text-end" : "");
+    row.dataset.id = msg.id;
+    const bubble = document.createElement("div");
+    bubble.style.cssText = "display: inline-block; padding: 8px 12px; border-radius: 10px;" +
+      (msg.is_admin ? "background-color: #003366; color: white;" : "background-color: #e6e6e6;");
+
+    const label = document.createElement("small");
+    const strong = document.createElement("strong");
+    strong.textContent = msg.is_admin ? chatBox.dataset.adminLabel : chatBox.dataset.userLabel;
+    label.appendChild(strong);
+    const text = document.createElement("div");
+    text.textContent = msg.message;
+    const time = document.createElement("small");
+    time.className = "text-muted";
+    time.style.fontSize = "0.8em";
+    time.textContent = msg.created_at_display;
+
+    bubble.append(label, text, time);
+    row.appendChild(bubble);
+    return row;
+  }
+
+  function appendMessage(msg) {
+    if (rendered.has(msg.id)) return;
+    rendered.add(msg.id);
+    const empty = chatBox.querySelector(".chat-empty");
+    if (empty) empty.remove();
+    chatBox.appendChild(buildRow(msg));
+    chatBox.scrollTop = chatBox.scrollHeight;
+  }
+
+  // 🔹 Старіші повідомлення — порціями, зі збереженням позиції прокрутки
+  let loadingOlder = false;
+  async function loadOlder() {
+    if (!apiUrl || !hasMore || loadingOlder) return;
+    const oldest = chatBox.querySelector("[data-id]");
+    if (!oldest) return;
+    loadingOlder = true;
+    try {
+      const response = await fetch(apiUrl + "?before=" + oldest.dataset.id);
+      if (!response.ok) return;
+      const data = await response.json();
+      const previousHeight = chatBox.scrollHeight;
+      const fragment = document.createDocumentFragment();
+      data.messages.forEach((msg) => {
+        if (!rendered.has(msg.id)) {
+          rendered.add(msg.id);
+          fragment.appendChild(buildRow(msg));
+        }
+      });
+      chatBox.insertBefore(fragment, chatBox.firstChild);
+      chatBox.scrollTop += chatBox.scrollHeight - previousHeight;
+      hasMore = data.has_more;
+    } finally {
+      loadingOlder = false;
+    }
+  }
+  chatBox.addEventListener("scroll", () => {
+    if (chatBox.scrollTop < 50) loadOlder();
+  });
+
+  let socket = null;
+  function connect() {
+    if (!("WebSocket" in window) || !chatBox.dataset.wsPath) return;
+    const scheme = location.protocol === "https:" ? "wss://" : "ws://";
+    socket = new WebSocket(scheme + location.host + chatBox.dataset.wsPath);
+    let opened = false;
+    socket.onopen = () => { opened = true; };
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === "message") appendMessage(data.message);
+    };
+    socket.onclose = () => {
+      socket = null;
+      if (opened) setTimeout(connect, 5000);
+    };
+  }
+  connect();
+
+  if (form) {
+    form.addEventListener("submit", async (event) => {
+      const input = form.querySelector("input[name=message]");
+      const text = input.value.trim();
+      if (socket && socket.readyState === WebSocket.OPEN) {
+        event.preventDefault();
+        if (text) socket.send(JSON.stringify({ message: text }));
+        input.value = "";
+        return;
+      }
+      if (!apiUrl) return;  // звичайний POST
+      event.preventDefault();
+      if (!text) return;
+      try {
+        const response = await fetch(apiUrl, { method: "POST", body: new FormData(form) });
+        if (!response.ok) throw new Error(response.status);
+        const data = await response.json();
+        appendMessage(data.message);
+        input.value = "";
+      } catch (err) {
+        form.submit();
+      }
+    });
+  }
+});